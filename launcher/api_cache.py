@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from launcher.config import get_app_dir
+
+CACHE_TTL = 60
+CACHE_MAX_BYTES = 4 * 1024 * 1024
+
+
+class ResponseCache:
+    def __init__(self, root: Path, ttl: float = CACHE_TTL, max_bytes: int = CACHE_MAX_BYTES):
+        self.root = root
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.root / (hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, key: str) -> dict | None:
+        p = self._path(key)
+        try:
+            entry = json.loads(p.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if entry.get("key") != key:
+            return None
+        return entry
+
+    def is_fresh(self, entry: dict) -> bool:
+        return time.time() - entry.get("stored_at", 0) < self.ttl
+
+    def put(self, key: str, body, etag: str | None, last_modified: str | None, next_url: str | None = None) -> None:
+        entry = {
+            "key": key,
+            "etag": etag,
+            "last_modified": last_modified,
+            "next": next_url,
+            "stored_at": time.time(),
+            "body": body,
+        }
+        p = self._path(key)
+        tmp = p.with_suffix(".tmp")
+        with self._lock:
+            tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, p)
+            self._evict()
+
+    def touch(self, key: str, entry: dict) -> None:
+        self.put(key, entry["body"], entry.get("etag"), entry.get("last_modified"), entry.get("next"))
+
+    def record(self, kind: str) -> None:
+        with self._lock:
+            setattr(self, kind, getattr(self, kind) + 1)
+
+    def stats(self) -> dict:
+        with self._lock:
+            files = list(self.root.glob("*.json"))
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "entries": len(files),
+                "bytes": sum(f.stat().st_size for f in files),
+            }
+
+    def _evict(self) -> None:
+        files = []
+        for f in self.root.glob("*.json"):
+            try:
+                st = f.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, f))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, f in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                f.unlink()
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            for f in self.root.glob("*.json"):
+                try:
+                    f.unlink()
+                except OSError:
+                    pass
+
+
+_cache: ResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(get_app_dir() / "cache" / "api")
+        return _cache
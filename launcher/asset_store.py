@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from launcher.atomic_io import link_or_copy
+from launcher.config import get_app_dir, load_config
+
+DEFAULT_BUDGET_MB = 512
+
+_lock = threading.Lock()
+
+
+def asset_key(asset: dict) -> str:
+    digest = asset.get("digest") or ""
+    if ":" in digest:
+        algo, value = digest.split(":", 1)
+        return f"{algo}-{value}"
+    return f"id{asset.get('id', 0)}-{asset.get('size', 0)}"
+
+
+class AssetStore:
+    def __init__(self, root: Path, budget_bytes: int):
+        self.root = root
+        self.objects = root / "objects"
+        self.index_path = root / "index.json"
+        self.budget_bytes = budget_bytes
+        self.objects.mkdir(parents=True, exist_ok=True)
+
+    def _load_index(self) -> dict:
+        try:
+            return json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self, index: dict) -> None:
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(index, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+    def get(self, asset: dict) -> Path | None:
+        key = asset_key(asset)
+        p = self.objects / key
+        with _lock:
+            index = self._load_index()
+            entry = index.get(key)
+            if entry is None or not p.exists():
+                return None
+            st = p.stat()
+            if asset.get("size") and st.st_size != asset["size"]:
+                return None
+            if entry.get("mtime_ns") and st.st_mtime_ns != entry["mtime_ns"]:
+                return None
+            entry["last_used"] = time.time()
+            self._save_index(index)
+        return p
+
+    def find(self, sha256: str) -> Path | None:
+        with _lock:
+            for key, entry in self._load_index().items():
+                if entry.get("sha256", key.removeprefix("sha256-")) != sha256:
+                    continue
+                p = self.objects / key
+                try:
+                    st = p.stat()
+                except OSError:
+                    return None
+                if st.st_size == entry.get("size") and st.st_mtime_ns == entry.get("mtime_ns"):
+                    return p
+                return None
+        return None
+
+    def incoming_path(self, asset: dict) -> Path:
+        return self.objects / (asset_key(asset) + ".incoming")
+
+    def add(self, asset: dict, src: Path, sha256: str | None = None) -> Path:
+        with _lock:
+            dst = self.objects / asset_key(asset)
+            os.replace(src, dst)
+            self._register(asset, dst, sha256)
+        return dst
+
+    def import_file(self, asset: dict, src: Path, sha256: str | None = None) -> Path:
+        with _lock:
+            dst = self.objects / asset_key(asset)
+            incoming = self.incoming_path(asset)
+            incoming.unlink(missing_ok=True)
+            link_or_copy(src, incoming)
+            os.replace(incoming, dst)
+            self._register(asset, dst, sha256)
+        return dst
+
+    def _register(self, asset: dict, dst: Path, sha256: str | None) -> None:
+        key = dst.name
+        st = dst.stat()
+        index = self._load_index()
+        index[key] = {
+            "name": asset.get("name", ""),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "last_used": time.time(),
+        }
+        if sha256:
+            index[key]["sha256"] = sha256
+        self._evict(index, keep=key)
+        self._save_index(index)
+
+    def _evict(self, index: dict, keep: str) -> None:
+        total = sum(e.get("size", 0) for e in index.values())
+        for key, entry in sorted(index.items(), key=lambda kv: kv[1].get("last_used", 0)):
+            if total <= self.budget_bytes:
+                break
+            if key == keep:
+                continue
+            try:
+                (self.objects / key).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue
+            total -= entry.get("size", 0)
+            del index[key]
+
+
+def get_asset_store() -> AssetStore:
+    cfg = load_config()
+    budget_mb = cfg.get("asset_store_budget_mb", DEFAULT_BUDGET_MB)
+    return AssetStore(get_app_dir() / "store", int(budget_mb) * 1024 * 1024)
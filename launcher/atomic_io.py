@@ -0,0 +1,70 @@
+import os
+import shutil
+from pathlib import Path
+
+STAGED_SUFFIX = ".wwmru-new"
+OLD_SUFFIX = ".wwmru-old"
+
+
+def staging_path(target: Path) -> Path:
+    return target.with_name(f".{target.name}{STAGED_SUFFIX}")
+
+
+def fsync_file(path: Path) -> None:
+    with open(path, "r+b") as f:
+        os.fsync(f.fileno())
+
+
+def fsync_dir(path: Path) -> None:
+    if os.name == "nt":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def link_or_copy(src: Path, dst: Path) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def discard(paths) -> None:
+    for p in paths:
+        try:
+            Path(p).unlink()
+        except FileNotFoundError:
+            pass
+
+
+def commit_files(staged: dict[Path, Path]) -> None:
+    kept: dict[Path, Path | None] = {}
+    try:
+        for target, src in staged.items():
+            if target.exists():
+                old = target.with_name(f".{target.name}{OLD_SUFFIX}")
+                discard([old])
+                link_or_copy(target, old)
+                kept[target] = old
+            else:
+                kept[target] = None
+            os.replace(src, target)
+    except BaseException:
+        for target, old in kept.items():
+            try:
+                if old is not None:
+                    os.replace(old, target)
+                else:
+                    discard([target])
+            except OSError:
+                pass
+        discard(staged.values())
+        raise
+    finally:
+        discard(old for old in kept.values() if old is not None)
+
+    for parent in {t.parent for t in staged}:
+        fsync_dir(parent)
@@ -0,0 +1,263 @@
+import hashlib
+import json
+import lzma
+import os
+import shutil
+import sys
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Iterator
+
+from launcher.atomic_io import commit_files, discard, fsync_file, staging_path
+from launcher.config import get_app_dir, load_config
+
+CHUNK_SIZE = 1024 * 1024
+CHUNK_MIN = 64 * 1024
+CHUNK_WINDOW = 32
+CHUNK_MASK = (1 << 11) - 1
+DEFAULT_KEEP = 5
+DEFAULT_CODEC = "zlib"
+
+_FICLONE = 0x40049409
+
+_CODECS = {
+    "zlib": (".z", lambda data: zlib.compress(data, 1), zlib.decompress),
+    "lzma": (".xz", lambda data: lzma.compress(data, preset=1), lzma.decompress),
+}
+
+_CHUNK_BITS = bytes(hashlib.sha256(bytes([b])).digest()[0] & 1 for b in range(256))
+_CHUNK_ANCHOR = bytes((1, 0, 0, 1, 0, 1))
+
+_lock = threading.Lock()
+
+
+class BackupError(Exception):
+    pass
+
+
+def _try_reflink(src: Path, dst: Path) -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+
+    try:
+        with open(src, "rb") as fs, open(dst, "wb") as fd:
+            fcntl.ioctl(fd.fileno(), _FICLONE, fs.fileno())
+        return True
+    except OSError:
+        discard([dst])
+        return False
+
+
+def _cut_point(buf: bytes) -> int:
+    limit = min(len(buf), CHUNK_SIZE)
+    if limit <= CHUNK_MIN:
+        return limit
+    marks = buf[CHUNK_MIN:limit].translate(_CHUNK_BITS)
+    pos = marks.find(_CHUNK_ANCHOR)
+    while pos != -1:
+        end = CHUNK_MIN + pos
+        if not zlib.crc32(buf[end - CHUNK_WINDOW:end]) & CHUNK_MASK:
+            return end
+        pos = marks.find(_CHUNK_ANCHOR, pos + 1)
+    return limit
+
+
+def _iter_chunks(f) -> Iterator[bytes]:
+    buf = f.read(2 * CHUNK_SIZE)
+    while buf:
+        cut = _cut_point(buf)
+        yield buf[:cut]
+        buf = buf[cut:]
+        if len(buf) < CHUNK_SIZE:
+            buf += f.read(CHUNK_SIZE)
+
+
+class BackupStore:
+    def __init__(self, root: Path, codec: str = DEFAULT_CODEC, keep: int = DEFAULT_KEEP):
+        if codec not in _CODECS:
+            raise BackupError(f"неизвестный кодек сжатия: {codec}")
+        self.root = root
+        self.codec = codec
+        self.keep = keep
+        self.chunks = root / "chunks"
+        self.blobs = root / "blobs"
+        self.snapshots = root / "snapshots"
+        for d in (self.chunks, self.blobs, self.snapshots):
+            d.mkdir(parents=True, exist_ok=True)
+
+    def _chunk_path(self, digest: str) -> Path | None:
+        for suffix, _, _ in _CODECS.values():
+            p = self.chunks / digest[:2] / (digest + suffix)
+            if p.exists():
+                return p
+        return None
+
+    def _put_chunk(self, digest: str, data: bytes) -> None:
+        if self._chunk_path(digest) is not None:
+            return
+        suffix, compress, _ = _CODECS[self.codec]
+        p = self.chunks / digest[:2] / (digest + suffix)
+        p.parent.mkdir(exist_ok=True)
+        tmp = p.with_name(p.name + ".tmp")
+        tmp.write_bytes(compress(data))
+        os.replace(tmp, p)
+
+    def _read_chunk(self, digest: str) -> bytes:
+        p = self._chunk_path(digest)
+        if p is None:
+            raise BackupError(f"в хранилище нет блока {digest}")
+        for suffix, _, decompress in _CODECS.values():
+            if p.name.endswith(suffix):
+                return decompress(p.read_bytes())
+        raise BackupError(f"неизвестный формат блока {p.name}")
+
+    def _store_file(self, src: Path) -> dict:
+        blob_tmp = self.blobs / (src.name + ".tmp")
+        if _try_reflink(src, blob_tmp):
+            digest = hashlib.sha256()
+            with open(blob_tmp, "rb") as f:
+                for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    digest.update(block)
+            sha = digest.hexdigest()
+            os.replace(blob_tmp, self.blobs / sha)
+            return {"sha256": sha, "size": src.stat().st_size, "mode": "reflink"}
+
+        file_hash = hashlib.sha256()
+        chunks = []
+        with open(src, "rb") as f:
+            for block in _iter_chunks(f):
+                file_hash.update(block)
+                digest = hashlib.sha256(block).hexdigest()
+                self._put_chunk(digest, block)
+                chunks.append(digest)
+        return {"sha256": file_hash.hexdigest(), "size": src.stat().st_size, "mode": "chunks", "chunks": chunks}
+
+    def _link_file(self, src: Path, sha256: str) -> dict | None:
+        blob = self.blobs / sha256
+        if not blob.exists():
+            try:
+                os.link(src, blob)
+            except OSError:
+                return None
+        return {"sha256": sha256, "size": blob.stat().st_size, "mode": "link"}
+
+    def snapshot(
+        self, locale_dir: Path, names: list[str], version: str, held: dict[str, tuple[Path, str]] | None = None
+    ) -> str | None:
+        present = [n for n in names if (locale_dir / n).exists()]
+        if not present or self.keep <= 0:
+            return None
+        held = held or {}
+
+        with _lock:
+            files = {}
+            for name in present:
+                entry = self._link_file(*held[name]) if name in held else None
+                files[name] = entry or self._store_file(locale_dir / name)
+            snap_id = time.strftime("%Y%m%d-%H%M%S") + f"-{int(time.time() * 1000) % 1000:03d}"
+            n = 1
+            while (self.snapshots / (snap_id + ".json")).exists():
+                n += 1
+                snap_id = f"{snap_id.rsplit('.', 1)[0]}.{n}"
+            manifest = {
+                "id": snap_id,
+                "created_at": time.time(),
+                "version": version,
+                "locale_dir": str(locale_dir),
+                "files": files,
+            }
+            tmp = self.snapshots / (snap_id + ".tmp")
+            tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+            os.replace(tmp, self.snapshots / (snap_id + ".json"))
+            self._prune()
+        return snap_id
+
+    def list_snapshots(self, locale_dir: Path | None = None) -> list[dict]:
+        result = []
+        for p in self.snapshots.glob("*.json"):
+            try:
+                manifest = json.loads(p.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if locale_dir is None or manifest.get("locale_dir") == str(locale_dir):
+                result.append(manifest)
+        return sorted(result, key=lambda m: m.get("created_at", 0), reverse=True)
+
+    def get_snapshot(self, snap_id: str) -> dict:
+        p = self.snapshots / (snap_id + ".json")
+        try:
+            return json.loads(p.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            raise BackupError(f"снимок {snap_id} не найден") from e
+
+    def _write_file(self, entry: dict, dst: Path) -> None:
+        h = hashlib.sha256()
+        if entry["mode"] in ("reflink", "link"):
+            blob = self.blobs / entry["sha256"]
+            if not _try_reflink(blob, dst):
+                shutil.copyfile(blob, dst)
+            with open(dst, "rb") as f:
+                for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    h.update(block)
+        else:
+            with open(dst, "wb") as f:
+                for digest in entry["chunks"]:
+                    data = self._read_chunk(digest)
+                    f.write(data)
+                    h.update(data)
+        if h.hexdigest() != entry["sha256"]:
+            raise BackupError(f"снимок повреждён: SHA-256 файла {dst.name} не совпадает")
+        fsync_file(dst)
+
+    def restore(self, snap_id: str, locale_dir: Path) -> dict:
+        manifest = self.get_snapshot(snap_id)
+        staged = {}
+        try:
+            for name, entry in manifest["files"].items():
+                target = locale_dir / name
+                tmp = staging_path(target)
+                self._write_file(entry, tmp)
+                staged[target] = tmp
+            commit_files(staged)
+        except BaseException:
+            discard(staged.values())
+            raise
+        return manifest
+
+    def _prune(self) -> None:
+        per_root: dict[str | None, int] = {}
+        live = []
+        for m in self.list_snapshots():
+            n = per_root[m.get("locale_dir")] = per_root.get(m.get("locale_dir"), 0) + 1
+            if n > self.keep:
+                discard([self.snapshots / (m["id"] + ".json")])
+            else:
+                live.append(m)
+
+        used_chunks = set()
+        used_blobs = set()
+        for m in live:
+            for entry in m["files"].values():
+                if entry["mode"] in ("reflink", "link"):
+                    used_blobs.add(entry["sha256"])
+                else:
+                    used_chunks.update(entry["chunks"])
+
+        for p in self.chunks.glob("*/*"):
+            if p.name.split(".")[0] not in used_chunks:
+                discard([p])
+        for p in self.blobs.iterdir():
+            if p.name not in used_blobs:
+                discard([p])
+
+
+def get_backup_store() -> BackupStore:
+    cfg = load_config()
+    return BackupStore(
+        get_app_dir() / "backup" / "versions",
+        codec=cfg.get("backup_codec", DEFAULT_CODEC),
+        keep=cfg.get("backup_keep", DEFAULT_KEEP),
+    )
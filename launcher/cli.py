@@ -0,0 +1,211 @@
+import argparse
+import json
+
+from launcher.config import load_config
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_NETWORK = 3
+EXIT_UPDATE_AVAILABLE = 10
+
+
+def _emit(args, payload: dict, text: str) -> None:
+    if args.json:
+        print(json.dumps(payload, ensure_ascii=False))
+    else:
+        print(text)
+
+
+def _game_root(args) -> str:
+    return args.game_root or load_config().get("game_root", "")
+
+
+def _network_error(e: Exception) -> bool:
+    from launcher.github_api import is_network_error
+
+    return is_network_error(e)
+
+
+def _run_install_op(args, op, *op_args) -> int:
+    game_root = _game_root(args)
+    if not game_root:
+        _emit(args, {"ok": False, "error": "game_root is not set"}, "Укажи папку игры: --game-root PATH")
+        return EXIT_USAGE
+
+    ok, version, message = op(game_root, *op_args)
+    _emit(args, {"ok": ok, "version": version, "message": message, "game_root": game_root}, message)
+    return EXIT_OK if ok else EXIT_FAILED
+
+
+def cmd_check(args) -> int:
+    from launcher.installer import get_latest_version, get_release_index_status
+
+    latest, notes = get_latest_version()
+    offline = get_release_index_status()["offline"]
+    installed = load_config().get("installed_version", "—")
+    update = installed != latest
+    text = f"Установлено: {installed}\nПоследняя версия: {latest}"
+    if update:
+        text += "\nДоступно обновление."
+    if offline:
+        text += "\nНет связи с GitHub, показаны сохранённые данные."
+    _emit(
+        args,
+        {"installed": installed, "latest": latest, "update_available": update, "offline": offline, "notes": notes},
+        text,
+    )
+    if offline:
+        return EXIT_NETWORK
+    return EXIT_UPDATE_AVAILABLE if update else EXIT_OK
+
+
+def cmd_install(args) -> int:
+    from launcher.installer import install_latest, install_version
+
+    if args.tag:
+        return _run_install_op(args, install_version, args.tag)
+    return _run_install_op(args, install_latest)
+
+
+def cmd_install_many(args) -> int:
+    from launcher.installer import install_many
+
+    results = install_many(args.roots, tag=args.tag, max_workers=args.jobs)
+    ok = all(r["ok"] for r in results)
+    lines = []
+    for r in results:
+        status = "OK" if r["ok"] else "ОШИБКА"
+        lines.append(f"[{status}] {r['game_root']} ({r['seconds']:.1f} с)\n{r['message']}")
+    _emit(args, {"ok": ok, "results": results}, "\n\n".join(lines))
+    if ok:
+        return EXIT_OK
+    return EXIT_NETWORK if all(r["network"] for r in results if not r["ok"]) else EXIT_FAILED
+
+
+def cmd_rollback(args) -> int:
+    from launcher.installer import rollback
+
+    return _run_install_op(args, rollback)
+
+
+def cmd_restore_backup(args) -> int:
+    from launcher.installer import restore_original
+
+    return _run_install_op(args, restore_original)
+
+
+def cmd_list_snapshots(args) -> int:
+    from launcher.installer import list_snapshots
+
+    snapshots = list_snapshots(_game_root(args))
+    lines = [
+        f"{s['id']}  версия {s.get('version', '?')}  файлы: {', '.join(s.get('files', {}))}"
+        for s in snapshots
+    ]
+    _emit(args, {"snapshots": snapshots}, "\n".join(lines) or "Снимков нет")
+    return EXIT_OK
+
+
+def cmd_restore_snapshot(args) -> int:
+    from launcher.installer import restore_snapshot
+
+    return _run_install_op(args, restore_snapshot, args.snapshot_id)
+
+
+def cmd_list_versions(args) -> int:
+    from launcher.installer import get_recent_versions
+
+    versions = get_recent_versions(limit=args.limit)
+    installed = load_config().get("installed_version", "—")
+    lines = [f"{v} (установлено)" if v == installed else v for v in versions]
+    _emit(args, {"installed": installed, "versions": versions}, "\n".join(lines) or "Нет данных")
+    return EXIT_OK
+
+
+def cmd_sources(args) -> int:
+    from launcher.installer import probe_sources
+
+    results = probe_sources()
+    lines = [
+        f"{s['name']}  " + ("недоступен" if s["latency_ms"] is None else f"{s['latency_ms']:.0f} мс")
+        for s in results
+    ]
+    _emit(args, {"sources": results}, "\n".join(lines))
+    return EXIT_OK if any(s["latency_ms"] is not None for s in results) else EXIT_NETWORK
+
+
+def cmd_stats(args) -> int:
+    from launcher.github_api import cache_stats
+    from launcher.tracing import load_cache_stats, load_stats
+
+    stats = load_stats()
+    cache = {**cache_stats(), **load_cache_stats()}
+    lines = [f"{'операция':<28}{'кол-во':>7}{'ошибок':>8}{'p50, мс':>10}{'p90, мс':>10}{'p99, мс':>10}{'макс, мс':>10}  МБ/с"]
+    for name, s in stats.items():
+        speed = f"{s['bytes_per_s'] / (1024 * 1024):.1f}" if s.get("bytes_per_s") else "—"
+        lines.append(
+            f"{name:<28}{s['count']:>7}{s['errors']:>8}"
+            f"{s['p50_ms']:>10.0f}{s['p90_ms']:>10.0f}{s['p99_ms']:>10.0f}{s['max_ms']:>10.0f}  {speed}"
+        )
+    text = "\n".join(lines) if stats else "Замеров пока нет"
+    text += (
+        f"\n\nКэш API: попаданий {cache['hits']}, подтверждено сервером {cache['revalidated']}, "
+        f"промахов {cache['misses']}; записей {cache['entries']}, {cache['bytes'] / 1024:.0f} КБ"
+    )
+    _emit(args, {"stats": stats, "cache": cache}, text)
+    return EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m launcher", description="WWMRU без графического интерфейса")
+    parser.add_argument("--json", action="store_true", help="вывод в формате JSON")
+    parser.add_argument("--game-root", help="папка игры (по умолчанию — из config.json)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("check", help="проверить наличие обновлений")
+    p.set_defaults(func=cmd_check)
+
+    p = sub.add_parser("install", help="установить последнюю или указанную версию")
+    p.add_argument("--tag", help="версия (тег релиза)")
+    p.set_defaults(func=cmd_install)
+
+    p = sub.add_parser("install-many", help="установить одну версию в несколько папок игры")
+    p.add_argument("roots", nargs="+", help="папки игры")
+    p.add_argument("--tag", help="версия (тег релиза)")
+    p.add_argument("--jobs", type=int, default=4, help="число параллельных установок")
+    p.set_defaults(func=cmd_install_many)
+
+    p = sub.add_parser("rollback", help="откатиться на предыдущую версию")
+    p.set_defaults(func=cmd_rollback)
+
+    p = sub.add_parser("restore-backup", help="вернуть оригинальные файлы игры")
+    p.set_defaults(func=cmd_restore_backup)
+
+    p = sub.add_parser("list-snapshots", help="показать снимки файлов перевода")
+    p.set_defaults(func=cmd_list_snapshots)
+
+    p = sub.add_parser("restore-snapshot", help="восстановить файлы из снимка")
+    p.add_argument("snapshot_id")
+    p.set_defaults(func=cmd_restore_snapshot)
+
+    p = sub.add_parser("list-versions", help="показать последние версии")
+    p.add_argument("--limit", type=int, default=5)
+    p.set_defaults(func=cmd_list_versions)
+
+    p = sub.add_parser("sources", help="проверить доступность источников релизов")
+    p.set_defaults(func=cmd_sources)
+
+    p = sub.add_parser("stats", help="сводка по времени операций")
+    p.set_defaults(func=cmd_stats)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except Exception as e:
+        _emit(args, {"ok": False, "error": str(e)}, f"Ошибка: {e}")
+        return EXIT_NETWORK if _network_error(e) else EXIT_FAILED
@@ -1,9 +1,50 @@
+import atexit
+import copy
 import json
+import os
 import sys
+import threading
 from pathlib import Path
 
 APP_FOLDER_NAME = "WWMRU"
 
+SAVE_DEBOUNCE = 0.5
+
+DEFAULT_CONFIG = {
+    "game_root": "",
+    "installed_version": "—",
+    "backup_enabled": True,
+    "backup_done": False,
+    "recent_versions": [],
+    "asset_store_budget_mb": 512,
+    "installed_hashes": {},
+    "backup_keep": 5,
+    "backup_codec": "zlib",
+    "prefetch_enabled": False,
+    "prefetch_kbps": 1024,
+    "check_interval_min": 30,
+    "sources": [{"type": "github"}],
+    "trace_enabled": True,
+}
+
+CONFIG_SCHEMA = {
+    "game_root": str,
+    "installed_version": str,
+    "backup_enabled": bool,
+    "backup_done": bool,
+    "recent_versions": list,
+    "asset_store_budget_mb": int,
+    "installed_hashes": dict,
+    "backup_keep": int,
+    "backup_codec": str,
+    "prefetch_enabled": bool,
+    "prefetch_kbps": int,
+    "check_interval_min": int,
+    "sources": list,
+    "trace_enabled": bool,
+    "http": dict,
+}
+
 
 def _base_dir() -> Path:
     if getattr(sys, "frozen", False):
@@ -17,33 +58,101 @@ def get_app_dir() -> Path:
     return d
 
 
-CONFIG_PATH = get_app_dir() / "config.json"
+CONFIG_PATH = _base_dir() / APP_FOLDER_NAME / "config.json"
+
+
+def _valid(key: str, value) -> bool:
+    expected = CONFIG_SCHEMA.get(key)
+    if expected is None:
+        return True
+    if expected is int:
+        return isinstance(value, int) and not isinstance(value, bool)
+    return isinstance(value, expected)
+
+
+class ConfigStore:
+    def __init__(self, path: Path, debounce: float = SAVE_DEBOUNCE):
+        self.path = path
+        self.debounce = debounce
+        self._data: dict | None = None
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self._dirty = False
+
+    def _ensure_loaded(self) -> dict:
+        if self._data is None:
+            data = copy.deepcopy(DEFAULT_CONFIG)
+            try:
+                raw = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                raw = {}
+            if isinstance(raw, dict):
+                for key, value in raw.items():
+                    if _valid(key, value):
+                        data[key] = value
+            self._data = data
+        return self._data
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return copy.deepcopy(self._ensure_loaded())
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            return copy.deepcopy(self._ensure_loaded().get(key, default))
+
+    def update(self, values: dict | None = None, **kwargs) -> None:
+        changes = dict(values or {}, **kwargs)
+        for key, value in changes.items():
+            if not _valid(key, value):
+                raise TypeError(f"config: недопустимое значение для '{key}': {value!r}")
+
+        with self._lock:
+            data = self._ensure_loaded()
+            for key, value in changes.items():
+                data[key] = copy.deepcopy(value)
+            self._dirty = True
+            self._schedule()
+
+    def _schedule(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.debounce, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self) -> None:
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                payload = json.dumps(self._data, ensure_ascii=False, indent=2)
+                self._dirty = False
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+
+
+config_store = ConfigStore(CONFIG_PATH)
+atexit.register(config_store.flush)
 
 
 def load_config() -> dict:
-    if CONFIG_PATH.exists():
-        try:
-            cfg = json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
-            cfg.setdefault("game_root", "")
-            cfg.setdefault("installed_version", "—")
-            cfg.setdefault("backup_enabled", True)
-            cfg.setdefault("backup_done", False)
-            cfg.setdefault("recent_versions", [])
-            return cfg
-        except Exception:
-            pass
-
-    return {
-        "game_root": "",
-        "installed_version": "—",
-        "backup_enabled": True,
-        "backup_done": False,
-        "recent_versions": [],
-    }
+    return config_store.snapshot()
+
+
+def update_config(values: dict | None = None, **kwargs) -> None:
+    config_store.update(values, **kwargs)
 
 
 def save_config(cfg: dict) -> None:
-    CONFIG_PATH.write_text(
-        json.dumps(cfg, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    config_store.update(cfg)
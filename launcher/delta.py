@@ -0,0 +1,206 @@
+import argparse
+import hashlib
+import json
+import struct
+import sys
+import zlib
+from pathlib import Path
+
+MAGIC = b"WWMRUDELTA1\n"
+DEFAULT_BLOCK_SIZE = 4096
+COPY_CHUNK_SIZE = 1024 * 1024
+
+_ADLER_MOD = 65521
+_OP_COPY = b"C"
+_OP_INSERT = b"I"
+
+
+class DeltaError(Exception):
+    pass
+
+
+def delta_asset_name(name: str, from_version: str) -> str:
+    return f"{name}.from-{from_version}.delta"
+
+
+def _roll(weak: int, out_byte: int, in_byte: int, block_size: int) -> int:
+    a = weak & 0xFFFF
+    b = weak >> 16
+    a = (a - out_byte + in_byte) % _ADLER_MOD
+    b = (b - block_size * out_byte + a - 1) % _ADLER_MOD
+    return (b << 16) | a
+
+
+def _encode_ops(ops: list) -> bytes:
+    out = bytearray()
+    for op in ops:
+        if op[0] == _OP_COPY:
+            out += _OP_COPY + struct.pack("<QI", op[1], op[2])
+        else:
+            out += _OP_INSERT + struct.pack("<I", len(op[1])) + op[1]
+    return bytes(out)
+
+
+def _decode_ops(data: bytes):
+    pos = 0
+    while pos < len(data):
+        op = data[pos:pos + 1]
+        pos += 1
+        if op == _OP_COPY:
+            offset, length = struct.unpack_from("<QI", data, pos)
+            pos += 12
+            yield _OP_COPY, offset, length
+        elif op == _OP_INSERT:
+            (length,) = struct.unpack_from("<I", data, pos)
+            pos += 4
+            yield _OP_INSERT, data[pos:pos + length]
+            pos += length
+        else:
+            raise DeltaError(f"неизвестная операция в дельте: {op!r}")
+
+
+def make_delta(base_path: Path, target_path: Path, out_path: Path, block_size: int = DEFAULT_BLOCK_SIZE) -> dict:
+    base = Path(base_path).read_bytes()
+    target = Path(target_path).read_bytes()
+
+    index: dict[int, list[int]] = {}
+    for off in range(0, len(base) - block_size + 1, block_size):
+        index.setdefault(zlib.adler32(base[off:off + block_size]), []).append(off)
+
+    ops: list = []
+    literal = bytearray()
+
+    def emit_copy(offset: int, length: int) -> None:
+        if literal:
+            ops.append((_OP_INSERT, bytes(literal)))
+            literal.clear()
+        if ops and ops[-1][0] == _OP_COPY and ops[-1][1] + ops[-1][2] == offset:
+            ops[-1] = (_OP_COPY, ops[-1][1], ops[-1][2] + length)
+        else:
+            ops.append((_OP_COPY, offset, length))
+
+    pos = 0
+    n = len(target)
+    weak = None
+    while pos + block_size <= n:
+        if weak is None:
+            weak = zlib.adler32(target[pos:pos + block_size])
+
+        match = None
+        for off in index.get(weak, ()):
+            if base[off:off + block_size] == target[pos:pos + block_size]:
+                match = off
+                break
+
+        if match is not None:
+            emit_copy(match, block_size)
+            pos += block_size
+            weak = None
+            continue
+
+        literal.append(target[pos])
+        if pos + block_size < n:
+            weak = _roll(weak, target[pos], target[pos + block_size], block_size)
+        pos += 1
+
+    literal += target[pos:]
+    if literal:
+        ops.append((_OP_INSERT, bytes(literal)))
+
+    header = {
+        "block_size": block_size,
+        "base_size": len(base),
+        "base_sha256": hashlib.sha256(base).hexdigest(),
+        "target_size": len(target),
+        "target_sha256": hashlib.sha256(target).hexdigest(),
+    }
+    header_raw = json.dumps(header).encode("utf-8")
+    body = zlib.compress(_encode_ops(ops), 9)
+
+    with open(out_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header_raw)))
+        f.write(header_raw)
+        f.write(body)
+
+    header["delta_size"] = Path(out_path).stat().st_size
+    return header
+
+
+def read_delta(delta_path: Path) -> tuple[dict, bytes]:
+    raw = Path(delta_path).read_bytes()
+    if not raw.startswith(MAGIC):
+        raise DeltaError("файл не является дельтой WWMRU")
+    pos = len(MAGIC)
+    (header_len,) = struct.unpack_from("<I", raw, pos)
+    pos += 4
+    header = json.loads(raw[pos:pos + header_len].decode("utf-8"))
+    try:
+        body = zlib.decompress(raw[pos + header_len:])
+    except zlib.error as e:
+        raise DeltaError(f"дельта повреждена: {e}") from e
+    return header, body
+
+
+def apply_delta(base_path: Path, delta_path: Path, out_path: Path, base_sha256: str | None = None) -> str:
+    header, body = read_delta(delta_path)
+
+    base_path = Path(base_path)
+    if base_path.stat().st_size != header["base_size"]:
+        raise DeltaError("размер исходного файла не совпадает с базой дельты")
+    if base_sha256 is not None and base_sha256 != header["base_sha256"]:
+        raise DeltaError("исходный файл не совпадает с базой дельты")
+
+    h = hashlib.sha256()
+    with open(base_path, "rb") as fb, open(out_path, "wb") as fo:
+        for op in _decode_ops(body):
+            if op[0] == _OP_COPY:
+                fb.seek(op[1])
+                remaining = op[2]
+                while remaining:
+                    chunk = fb.read(min(remaining, COPY_CHUNK_SIZE))
+                    if not chunk:
+                        raise DeltaError("исходный файл короче, чем ожидает дельта")
+                    fo.write(chunk)
+                    h.update(chunk)
+                    remaining -= len(chunk)
+            else:
+                fo.write(op[1])
+                h.update(op[1])
+
+    digest = h.hexdigest()
+    if digest != header["target_sha256"]:
+        raise DeltaError("результат применения дельты не совпадает с ожидаемым SHA-256")
+    return digest
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m launcher.delta", description="Дельты файлов перевода WWMRU")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_make = sub.add_parser("make", help="создать дельту OLD -> NEW")
+    p_make.add_argument("old", type=Path)
+    p_make.add_argument("new", type=Path)
+    p_make.add_argument("out", type=Path)
+    p_make.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE)
+
+    p_apply = sub.add_parser("apply", help="применить дельту к OLD")
+    p_apply.add_argument("old", type=Path)
+    p_apply.add_argument("delta", type=Path)
+    p_apply.add_argument("out", type=Path)
+
+    args = parser.parse_args(argv)
+    try:
+        if args.cmd == "make":
+            info = make_delta(args.old, args.new, args.out, block_size=args.block_size)
+            print(json.dumps(info, ensure_ascii=False, indent=2))
+        else:
+            print(apply_delta(args.old, args.delta, args.out))
+    except (OSError, DeltaError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,27 +1,232 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterator
+from urllib.parse import urlencode
+
 import requests
 
+from launcher.api_cache import get_response_cache
+from launcher.hashing import sha256_file, update_from_file
+from launcher.http_client import abort_response, get_client
+from launcher.progress import ProgressTracker
+from launcher.tracing import span
+
 GITHUB_API = "https://api.github.com"
 
+CHUNK_SIZE = 1024 * 256
+DOWNLOAD_RETRIES = 5
+RETRY_BACKOFF = 1.0
+
+CHECKSUM_ASSETS = ("SHA256SUMS", "SHA256SUMS.txt", "sha256sums.txt", "checksums.txt")
+
+SEGMENT_MIN_SIZE = 4 * 1024 * 1024
+SEGMENT_MAX_WORKERS = 6
+
+CANCEL_POLL = 0.2
+
+RELEASES_PER_PAGE = 30
+
+
+class IncompleteDownloadError(IOError):
+    pass
+
+
+class RangeNotSupportedError(IOError):
+    pass
+
+
+class DownloadCancelledError(Exception):
+    pass
+
+
+class ChecksumMismatchError(IOError):
+    pass
+
+
+class RateLimitedError(IOError):
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def is_network_error(e: BaseException) -> bool:
+    return isinstance(e, (requests.RequestException, IncompleteDownloadError, RangeNotSupportedError, RateLimitedError))
+
+
+_rate_limit = {"remaining": None, "reset": None}
+
+
+def _check_cancel(cancel: threading.Event | None) -> None:
+    if cancel is not None and cancel.is_set():
+        raise DownloadCancelledError("загрузка отменена")
+
+
+@contextmanager
+def _abort_on_cancel(r: requests.Response, cancel: threading.Event | None):
+    if cancel is None:
+        yield
+        return
+
+    finished = threading.Event()
+
+    def watch():
+        while not finished.wait(CANCEL_POLL):
+            if cancel.is_set():
+                abort_response(r)
+                return
+
+    threading.Thread(target=watch, daemon=True).start()
+    try:
+        yield
+    finally:
+        finished.set()
+
+
+def _sleep(delay: float, cancel: threading.Event | None) -> None:
+    if cancel is None:
+        time.sleep(delay)
+    elif cancel.wait(delay):
+        raise DownloadCancelledError("загрузка отменена")
+
+
+def _backoff(attempt: int, cancel: threading.Event | None) -> None:
+    _sleep(RETRY_BACKOFF * (2 ** attempt), cancel)
+
+
+class _Throttle:
+    def __init__(self, rate: int):
+        self.rate = rate
+        self.started = time.monotonic()
+        self.received = 0
+
+    def consume(self, n: int, cancel: threading.Event | None) -> None:
+        self.received += n
+        delay = self.received / self.rate - (time.monotonic() - self.started)
+        if delay > 0:
+            _sleep(delay, cancel)
+
+
+def _note_rate_limit(r: requests.Response) -> None:
+    remaining = r.headers.get("X-RateLimit-Remaining")
+    reset = r.headers.get("X-RateLimit-Reset")
+    if remaining is not None and remaining.isdigit():
+        _rate_limit["remaining"] = int(remaining)
+    if reset is not None and reset.isdigit():
+        _rate_limit["reset"] = float(reset)
+
+
+def _retry_after(r: requests.Response) -> float | None:
+    value = r.headers.get("Retry-After")
+    if value is not None and value.isdigit():
+        return float(value)
+    if r.headers.get("X-RateLimit-Remaining") == "0" and _rate_limit["reset"]:
+        return max(0.0, _rate_limit["reset"] - time.time())
+    return None
+
+
+def _check_rate_limit() -> None:
+    reset = _rate_limit["reset"]
+    if _rate_limit["remaining"] == 0 and reset and reset > time.time():
+        raise RateLimitedError("исчерпан лимит запросов к GitHub API", reset - time.time())
+
+
+def rate_limit_status() -> dict:
+    return dict(_rate_limit)
+
+
+def _get_page(url: str, params: dict | None = None) -> tuple[object, str | None]:
+    key = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+    cache = get_response_cache()
+    entry = cache.get(key)
+
+    if entry is not None and cache.is_fresh(entry):
+        cache.record("hits")
+        with span("http.api.cached", url=url, cache="hits"):
+            return entry["body"], entry.get("next")
+
+    headers = {"Accept": "application/vnd.github+json"}
+    if entry is not None:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    _check_rate_limit()
+    with span("http.api", url=url) as s:
+        r = get_client().get(url, params=params, headers=headers)
+        s.set(status=r.status_code, bytes=len(r.content))
+        if r.status_code == 304 and entry is not None:
+            s.set(cache="revalidated")
+        elif r.ok:
+            s.set(cache="misses")
+    _note_rate_limit(r)
+    if r.status_code in (403, 429):
+        retry_after = _retry_after(r)
+        if retry_after is not None:
+            raise RateLimitedError("исчерпан лимит запросов к GitHub API", retry_after)
+    if r.status_code == 304 and entry is not None:
+        cache.touch(key, entry)
+        cache.record("revalidated")
+        return entry["body"], entry.get("next")
+
+    r.raise_for_status()
+    body = r.json()
+    next_url = r.links.get("next", {}).get("url")
+    cache.put(key, body, r.headers.get("ETag"), r.headers.get("Last-Modified"), next_url)
+    cache.record("misses")
+    return body, next_url
+
+
+def _get_json(url: str, params: dict | None = None):
+    return _get_page(url, params)[0]
+
+
+def cache_stats() -> dict:
+    return get_response_cache().stats()
+
 
 def get_latest_release(owner: str, repo: str) -> dict:
     url = f"{GITHUB_API}/repos/{owner}/{repo}/releases/latest"
-    r = requests.get(url, timeout=30)
-    r.raise_for_status()
-    return r.json()
+    return _get_json(url)
+
+
+def iter_release_pages(
+    owner: str,
+    repo: str,
+    per_page: int = RELEASES_PER_PAGE,
+    url: str | None = None,
+    api: str | None = None,
+) -> Iterator[tuple[list[dict], str | None]]:
+    params = None
+    if url is None:
+        url = f"{api or GITHUB_API}/repos/{owner}/{repo}/releases"
+        params = {"per_page": per_page}
+    while url:
+        page, next_url = _get_page(url, params)
+        yield page, next_url
+        url, params = next_url, None
+
+
+def iter_releases(owner: str, repo: str, per_page: int = RELEASES_PER_PAGE) -> Iterator[dict]:
+    for page, _next_url in iter_release_pages(owner, repo, per_page):
+        yield from page
 
 
 def get_recent_releases(owner: str, repo: str, limit: int = 5) -> list[dict]:
-    url = f"{GITHUB_API}/repos/{owner}/{repo}/releases"
-    r = requests.get(url, params={"per_page": limit}, timeout=30)
-    r.raise_for_status()
-    return r.json()
+    return list(islice(iter_releases(owner, repo, per_page=min(limit, 100)), limit))
 
 
-def get_release_by_tag(owner: str, repo: str, tag: str) -> dict:
-    url = f"{GITHUB_API}/repos/{owner}/{repo}/releases/tags/{tag}"
-    r = requests.get(url, timeout=30)
-    r.raise_for_status()
-    return r.json()
+def get_release_by_tag(owner: str, repo: str, tag: str, api: str | None = None) -> dict:
+    url = f"{api or GITHUB_API}/repos/{owner}/{repo}/releases/tags/{tag}"
+    return _get_json(url)
 
 
 def find_asset(release_json: dict, name: str) -> dict | None:
@@ -31,11 +236,415 @@ def find_asset(release_json: dict, name: str) -> dict | None:
     return None
 
 
-def download_asset(asset: dict, dst_path: str) -> None:
-    url = asset["browser_download_url"]
-    with requests.get(url, stream=True, timeout=120) as r:
+def asset_sha256(asset: dict) -> str | None:
+    algo, _, value = (asset.get("digest") or "").partition(":")
+    if algo.lower() == "sha256" and value:
+        return value.lower()
+    return None
+
+
+def _parse_checksums(text: str) -> dict[str, str]:
+    result: dict[str, str] = {}
+    for line in text.splitlines():
+        parts = line.strip().split()
+        if len(parts) >= 2 and len(parts[0]) == 64:
+            result[parts[-1].lstrip("*")] = parts[0].lower()
+    return result
+
+
+def get_first(urls: list[str]) -> requests.Response:
+    error: Exception | None = None
+    for url in urls:
+        try:
+            with span("http.get", url=url) as s:
+                r = get_client().get(url)
+                s.set(status=r.status_code, bytes=len(r.content))
+                r.raise_for_status()
+            return r
+        except requests.RequestException as e:
+            error = e
+    raise error or LookupError("нет адресов для загрузки")
+
+
+def get_release_checksums(
+    release_json: dict,
+    urls: Callable[[dict], list[str]] | None = None,
+) -> dict[str, str]:
+    checksums: dict[str, str] = {}
+    for name in CHECKSUM_ASSETS:
+        asset = find_asset(release_json, name)
+        if asset:
+            r = get_first(urls(asset) if urls else [asset["browser_download_url"]])
+            checksums.update(_parse_checksums(r.text))
+            break
+
+    for asset in release_json.get("assets", []):
+        digest = asset_sha256(asset)
+        if digest:
+            checksums[asset["name"]] = digest
+    return checksums
+
+
+def _read_sidecar(meta_path: Path) -> dict:
+    try:
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_sidecar(meta_path: Path, meta: dict) -> None:
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+
+
+def _reset_part(part: Path, meta_path: Path) -> None:
+    part.unlink(missing_ok=True)
+    meta_path.unlink(missing_ok=True)
+
+
+def _content_total(r: requests.Response) -> int | None:
+    if r.status_code == 206:
+        total = r.headers.get("Content-Range", "").rpartition("/")[2]
+        return int(total) if total.isdigit() else None
+    length = r.headers.get("Content-Length")
+    return int(length) if length and length.isdigit() else None
+
+
+def _download_once(
+    url: str,
+    expected_size: int | None,
+    part: Path,
+    meta_path: Path,
+    cancel: threading.Event | None = None,
+    rate_limit: int | None = None,
+    report: Callable[[int], None] | None = None,
+) -> str:
+    meta = _read_sidecar(meta_path)
+    offset = part.stat().st_size if part.exists() and meta and "segments" not in meta else 0
+
+    headers = {}
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+        if meta.get("etag"):
+            headers["If-Range"] = meta["etag"]
+
+    with span("http.download", url=url, offset=offset) as s:
+        with get_client().stream(url, headers=headers) as r, _abort_on_cancel(r, cancel):
+            if r.status_code == 416:
+                _reset_part(part, meta_path)
+                raise IncompleteDownloadError("сервер отклонил диапазон, загрузка начнётся заново")
+            r.raise_for_status()
+
+            etag = r.headers.get("ETag")
+            if offset and r.status_code == 206 and meta.get("etag") and etag and etag != meta["etag"]:
+                _reset_part(part, meta_path)
+                raise IncompleteDownloadError("файл на сервере изменился, загрузка начнётся заново")
+            if r.status_code != 206:
+                offset = 0
+
+            total = _content_total(r) or expected_size
+            if offset == 0:
+                _write_sidecar(meta_path, {"url": url, "size": total, "etag": etag})
+
+            h = hashlib.sha256()
+            if offset:
+                update_from_file(h, part)
+            throttle = _Throttle(rate_limit) if rate_limit else None
+            pos = offset
+            if report is not None:
+                report(pos)
+            with open(part, "ab" if offset else "wb") as f:
+                for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                    _check_cancel(cancel)
+                    if chunk:
+                        f.write(chunk)
+                        h.update(chunk)
+                        pos += len(chunk)
+                        if report is not None:
+                            report(pos)
+                        if throttle is not None:
+                            throttle.consume(len(chunk), cancel)
+        s.set(status=r.status_code, bytes=pos - offset)
+
+    size = part.stat().st_size
+    if total is not None and size != total:
+        raise IncompleteDownloadError(f"получено {size} из {total} байт")
+    return h.hexdigest()
+
+
+def _switch_source(part: Path, meta_path: Path, expected_sha256: str | None) -> None:
+    meta = _read_sidecar(meta_path)
+    if not expected_sha256 or not meta:
+        _reset_part(part, meta_path)
+        return
+    meta["etag"] = None
+    _write_sidecar(meta_path, meta)
+
+
+def _is_retryable(e: Exception) -> bool:
+    if isinstance(e, requests.HTTPError):
+        return e.response is not None and e.response.status_code >= 500
+    return isinstance(
+        e,
+        (
+            requests.ConnectionError,
+            requests.Timeout,
+            requests.exceptions.ChunkedEncodingError,
+            IncompleteDownloadError,
+        ),
+    )
+
+
+def _probe_ranges(url: str) -> tuple[int, str | None] | None:
+    client = get_client()
+    with client.stream(url, headers={"Range": "bytes=0-0"}, timeout=client.api_timeout) as r:
         r.raise_for_status()
-        with open(dst_path, "wb") as f:
-            for chunk in r.iter_content(chunk_size=1024 * 256):
-                if chunk:
+        if r.status_code != 206:
+            return None
+        total = _content_total(r)
+        if total is None:
+            return None
+        return total, r.headers.get("ETag")
+
+
+class _Segment:
+    def __init__(self, start: int, end: int, pos: int | None = None):
+        self.start = start
+        self.pos = start if pos is None else pos
+        self.end = end
+        self.resumed_at = self.pos
+        self.started_at = time.monotonic()
+
+    def remaining(self) -> int:
+        return self.end - self.pos
+
+    def throughput(self) -> float:
+        elapsed = time.monotonic() - self.started_at
+        return (self.pos - self.resumed_at) / elapsed if elapsed > 0 else 0.0
+
+
+class _SegmentedDownload:
+    def __init__(
+        self,
+        url: str,
+        size: int,
+        etag: str | None,
+        part: Path,
+        meta_path: Path,
+        max_workers: int,
+        cancel: threading.Event | None = None,
+        report: Callable[[int], None] | None = None,
+    ):
+        self.url = url
+        self.size = size
+        self.etag = etag
+        self.part = part
+        self.meta_path = meta_path
+        self.max_workers = max_workers
+        self.segments: list[_Segment] = []
+        self.pending: list[_Segment] = []
+        self.lock = threading.Lock()
+        self.failed = threading.Event()
+        self.cancel = cancel
+        self.report = report
+
+    def _steal(self) -> _Segment | None:
+        with self.lock:
+            best = None
+            best_eta = 0.0
+            for seg in self.segments:
+                rem = seg.remaining()
+                if rem < SEGMENT_MIN_SIZE:
+                    continue
+                tp = seg.throughput()
+                eta = rem / tp if tp > 0 else float("inf")
+                if best is None or eta > best_eta:
+                    best, best_eta = seg, eta
+            if best is None:
+                return None
+
+            mid = best.pos + best.remaining() // 2
+            stolen = _Segment(mid, best.end)
+            best.end = mid
+            self.segments.append(stolen)
+            return stolen
+
+    def _fetch_once(self, seg: _Segment) -> None:
+        headers = {"Range": f"bytes={seg.pos}-{seg.end - 1}"}
+        if self.etag:
+            headers["If-Range"] = self.etag
+
+        with get_client().stream(self.url, headers=headers) as r, _abort_on_cancel(r, self.cancel):
+            r.raise_for_status()
+            if r.status_code != 206:
+                raise RangeNotSupportedError("сервер не вернул запрошенный диапазон")
+
+            with open(self.part, "r+b") as f:
+                f.seek(seg.pos)
+                for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                    _check_cancel(self.cancel)
+                    if self.failed.is_set():
+                        return
+                    if not chunk:
+                        continue
+                    with self.lock:
+                        end = seg.end
+                    if seg.pos >= end:
+                        return
+                    chunk = chunk[: end - seg.pos]
                     f.write(chunk)
+                    with self.lock:
+                        seg.pos += len(chunk)
+                        done = sum(s.pos - s.start for s in self.segments)
+                    if self.report is not None:
+                        self.report(done)
+                    if seg.pos >= end:
+                        return
+
+        if seg.pos < seg.end:
+            raise IncompleteDownloadError(f"сегмент оборван на {seg.pos} из {seg.end} байт")
+
+    def _fetch(self, seg: _Segment) -> None:
+        for attempt in range(DOWNLOAD_RETRIES + 1):
+            try:
+                self._fetch_once(seg)
+                return
+            except Exception as e:
+                _check_cancel(self.cancel)
+                if attempt == DOWNLOAD_RETRIES or not _is_retryable(e):
+                    raise
+                _backoff(attempt, self.cancel)
+
+    def _next(self) -> _Segment | None:
+        with self.lock:
+            if self.pending:
+                return self.pending.pop(0)
+        return self._steal()
+
+    def _worker(self) -> None:
+        try:
+            seg = self._next()
+            while seg is not None and not self.failed.is_set():
+                self._fetch(seg)
+                self._save()
+                seg = self._next()
+        except Exception:
+            self.failed.set()
+            raise
+
+    def _save(self) -> None:
+        with self.lock:
+            segments = [[seg.start, seg.pos, seg.end] for seg in self.segments]
+            _write_sidecar(self.meta_path, {"url": self.url, "size": self.size, "etag": self.etag, "segments": segments})
+
+    def run(self, resume: list[list[int]] | None = None) -> None:
+        count = max(1, min(self.max_workers, get_client().pool_size - 2, self.size // SEGMENT_MIN_SIZE))
+        if resume:
+            self.segments = [_Segment(start, end, pos) for start, pos, end in resume]
+        else:
+            with open(self.part, "wb") as f:
+                f.truncate(self.size)
+            step = self.size // count
+            for i in range(count):
+                end = self.size if i == count - 1 else (i + 1) * step
+                self.segments.append(_Segment(i * step, end))
+        self.pending = [seg for seg in self.segments if seg.pos < seg.end]
+        self._save()
+        if self.report is not None:
+            self.report(sum(seg.pos - seg.start for seg in self.segments))
+
+        try:
+            with ThreadPoolExecutor(max_workers=count) as ex:
+                futures = [ex.submit(self._worker) for _ in range(count)]
+                for fut in futures:
+                    fut.result()
+        finally:
+            self._save()
+
+
+def download_asset(
+    asset: dict,
+    dst_path: str,
+    retries: int = DOWNLOAD_RETRIES,
+    segmented: bool = False,
+    cancel: threading.Event | None = None,
+    expected_sha256: str | None = None,
+    rate_limit: int | None = None,
+    progress: ProgressTracker | None = None,
+    urls: list[str] | None = None,
+) -> str:
+    urls = list(urls or [asset["browser_download_url"]])
+    dst = Path(dst_path)
+    part = dst.with_name(dst.name + ".part")
+    meta_path = dst.with_name(dst.name + ".part.json")
+
+    report = None
+    if progress is not None:
+        progress.expect(asset["name"], asset.get("size"))
+        report = partial(progress.update, asset["name"])
+
+    meta = _read_sidecar(meta_path)
+    single_stream_part = part.exists() and bool(meta) and "segments" not in meta
+    if segmented and not rate_limit and not single_stream_part and (asset.get("size") or 0) >= 2 * SEGMENT_MIN_SIZE:
+        _check_cancel(cancel)
+        try:
+            probe = _probe_ranges(urls[0])
+        except requests.RequestException:
+            if len(urls) == 1:
+                raise
+            probe = None
+            urls.append(urls.pop(0))
+        if probe is not None:
+            size, etag = probe
+            resume = None
+            if part.exists() and part.stat().st_size == size and etag and meta.get("etag") == etag and meta.get("size") == size:
+                resume = meta.get("segments")
+            if not resume:
+                _reset_part(part, meta_path)
+            try:
+                with span("http.download", url=urls[0], segmented=True, bytes=size, resumed=bool(resume)):
+                    _SegmentedDownload(urls[0], size, etag, part, meta_path, SEGMENT_MAX_WORKERS, cancel, report).run(resume)
+            except RangeNotSupportedError:
+                _reset_part(part, meta_path)
+            except DownloadCancelledError:
+                raise
+            except Exception:
+                if len(urls) == 1:
+                    raise
+                _reset_part(part, meta_path)
+                urls.append(urls.pop(0))
+            else:
+                with span("verify", bytes=size):
+                    digest = sha256_file(part)
+                _verify_part(part, meta_path, digest, expected_sha256)
+                os.replace(part, dst)
+                meta_path.unlink(missing_ok=True)
+                return digest
+
+    source = 0
+    for attempt in range(retries + 1):
+        try:
+            digest = _download_once(urls[source], asset.get("size"), part, meta_path, cancel, rate_limit, report)
+            break
+        except Exception as e:
+            _check_cancel(cancel)
+            failover = len(urls) > 1 and isinstance(e, requests.RequestException)
+            if attempt == retries or not (failover or _is_retryable(e)):
+                raise
+            if len(urls) > 1:
+                source = (source + 1) % len(urls)
+                _switch_source(part, meta_path, expected_sha256)
+            if source == 0:
+                _backoff(attempt, cancel)
+
+    _verify_part(part, meta_path, digest, expected_sha256)
+    os.replace(part, dst)
+    meta_path.unlink(missing_ok=True)
+    return digest
+
+
+def _verify_part(part: Path, meta_path: Path, digest: str, expected_sha256: str | None) -> None:
+    if expected_sha256 and digest != expected_sha256.lower():
+        _reset_part(part, meta_path)
+        raise ChecksumMismatchError(
+            f"контрольная сумма не совпадает: ожидалось {expected_sha256}, получено {digest}"
+        )
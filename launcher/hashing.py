@@ -0,0 +1,31 @@
+import hashlib
+from pathlib import Path
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def update_from_file(h, path: Path) -> None:
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            h.update(chunk)
+
+
+def sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    update_from_file(h, path)
+    return h.hexdigest()
+
+
+def copy_with_sha256(src: Path, dst: Path) -> str:
+    h = hashlib.sha256()
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        while True:
+            chunk = fin.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            h.update(chunk)
+            fout.write(chunk)
+    return h.hexdigest()
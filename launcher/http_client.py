@@ -0,0 +1,205 @@
+import socket
+import threading
+from pathlib import Path
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+from launcher.config import load_config
+
+DEFAULT_POOL_SIZE = 10
+API_TIMEOUT = 30
+DOWNLOAD_TIMEOUT = 120
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+
+HTTP_CONFIG_KEYS = {
+    "pool_size": int,
+    "api_timeout": (int, float),
+    "download_timeout": (int, float),
+    "retries": int,
+    "backoff": (int, float),
+    "headers": dict,
+}
+
+DEFAULT_HEADERS = {
+    "User-Agent": "WWMRU-launcher",
+}
+
+
+class _FileSlice:
+    def __init__(self, f, length: int):
+        self._f = f
+        self._left = length
+
+    def read(self, n: int = -1) -> bytes:
+        if self._left <= 0:
+            return b""
+        n = self._left if n is None or n < 0 else min(n, self._left)
+        data = self._f.read(n)
+        self._left -= len(data)
+        return data
+
+    def close(self) -> None:
+        if self._f is not None:
+            self._f.close()
+
+
+def _parse_range(value: str | None, size: int) -> tuple[int, int] | None:
+    if not value or not value.startswith("bytes="):
+        return None
+    start, _, end = value[6:].partition("-")
+    if not start.isdigit():
+        return None
+    first = int(start)
+    last = int(end) if end.isdigit() else size - 1
+    return first, min(last, size - 1)
+
+
+class LocalFileAdapter(BaseAdapter):
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        response.headers = CaseInsensitiveDict()
+
+        parsed = urlparse(request.url)
+        path = Path(url2pathname(f"//{parsed.netloc}{parsed.path}" if parsed.netloc else parsed.path))
+        try:
+            st = path.stat()
+            f = open(path, "rb") if request.method == "GET" else None
+        except OSError:
+            response.status_code = 404
+            response.reason = "Not Found"
+            response.raw = _FileSlice(None, 0)
+            return response
+
+        size = st.st_size
+        etag = f'"{st.st_mtime_ns:x}-{size:x}"'
+        first, last = 0, size - 1
+        response.status_code = 200
+        response.reason = "OK"
+
+        rng = _parse_range(request.headers.get("Range"), size)
+        if_range = request.headers.get("If-Range")
+        if rng is not None and (if_range is None or if_range == etag):
+            if rng[0] >= size:
+                if f is not None:
+                    f.close()
+                response.status_code = 416
+                response.reason = "Range Not Satisfiable"
+                response.headers["Content-Range"] = f"bytes */{size}"
+                response.raw = _FileSlice(None, 0)
+                return response
+            first, last = rng
+            response.status_code = 206
+            response.reason = "Partial Content"
+            response.headers["Content-Range"] = f"bytes {first}-{last}/{size}"
+
+        length = max(0, last - first + 1)
+        response.headers["Content-Length"] = str(length)
+        response.headers["ETag"] = etag
+        response.headers["Accept-Ranges"] = "bytes"
+        if f is not None:
+            f.seek(first)
+        response.raw = _FileSlice(f, length if f is not None else 0)
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+class HttpClient:
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        api_timeout: float = API_TIMEOUT,
+        download_timeout: float = DOWNLOAD_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        headers: dict | None = None,
+    ):
+        self.pool_size = pool_size
+        self.api_timeout = api_timeout
+        self.download_timeout = download_timeout
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=0,
+            status=retries,
+            backoff_factor=backoff,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.mount("file://", LocalFileAdapter())
+        self.session.headers.update(DEFAULT_HEADERS)
+        if headers:
+            self.session.headers.update(headers)
+
+    def get(
+        self,
+        url: str,
+        params: dict | None = None,
+        headers: dict | None = None,
+        timeout: float | None = None,
+    ) -> requests.Response:
+        return self.session.get(url, params=params, headers=headers, timeout=timeout or self.api_timeout)
+
+    def stream(self, url: str, headers: dict | None = None, timeout: float | None = None) -> requests.Response:
+        return self.session.get(url, headers=headers, stream=True, timeout=timeout or self.download_timeout)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def abort_response(response: requests.Response) -> None:
+    conn = getattr(response.raw, "_connection", None)
+    sock = getattr(conn, "sock", None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+    response.close()
+
+
+_client: HttpClient | None = None
+_client_lock = threading.Lock()
+
+
+def _http_settings(raw: dict) -> dict:
+    return {
+        key: value
+        for key, value in raw.items()
+        if key in HTTP_CONFIG_KEYS and isinstance(value, HTTP_CONFIG_KEYS[key]) and not isinstance(value, bool)
+    }
+
+
+def get_client() -> HttpClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient(**_http_settings(load_config().get("http", {})))
+        return _client
+
+
+def configure_client(**kwargs) -> HttpClient:
+    global _client
+    with _client_lock:
+        old = _client
+        _client = HttpClient(**kwargs)
+    if old is not None:
+        old.close()
+    return _client
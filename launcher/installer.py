@@ -1,15 +1,38 @@
+import hashlib
+import json
+import os
 import shutil
-import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Callable, NamedTuple
 
-from launcher.config import get_app_dir, load_config, save_config
+from launcher.asset_store import get_asset_store
+from launcher.atomic_io import commit_files, discard, fsync_file, staging_path
+from launcher.backup_store import get_backup_store
+from launcher.config import get_app_dir, load_config, update_config
+from launcher.delta import apply_delta, delta_asset_name
 from launcher.github_api import (
+    DownloadCancelledError,
+    asset_sha256,
     download_asset,
     find_asset,
-    get_latest_release,
-    get_recent_releases,
-    get_release_by_tag,
+    is_network_error,
 )
+from launcher.hashing import copy_with_sha256, sha256_file
+from launcher.progress import (
+    PHASE_BACKUP,
+    PHASE_DOWNLOAD,
+    PHASE_METADATA,
+    PHASE_VERIFY,
+    PHASE_WRITE,
+    Progress,
+    ProgressTracker,
+)
+from launcher.release_index import ReleaseIndex, first_stable, release_tag
+from launcher.sources import SourceSet
+from launcher.tracing import span
 
 OWNER = "zvgna"
 REPO = "translate"
@@ -17,6 +40,19 @@ REPO = "translate"
 ASSET_MAIN = "translate_words_map_en"
 ASSET_DIFF = "translate_words_map_en_diff"
 
+FETCH_WORKERS = 2
+FLEET_WORKERS = 4
+PREFETCH_KBPS = 1024
+
+SOURCE_STORE = "store"
+SOURCE_DELTA = "delta"
+SOURCE_NETWORK = "network"
+
+sources = SourceSet(OWNER, REPO)
+release_index = ReleaseIndex(OWNER, REPO, sources=sources)
+
+_backup_lock = threading.Lock()
+
 RELATIVE_LOCALE_DIR = Path("Where Winds Meet") / "Package" / "HD" / "oversea" / "locale"
 
 
@@ -36,97 +72,689 @@ def _resolve_base(user_selected: Path) -> Path:
     return user_selected
 
 
-def _backup_originals_once(target_main: Path, target_diff: Path) -> None:
-    cfg = load_config()
-    if not cfg.get("backup_enabled", True):
+def resolve_game_root(user_selected_path: str) -> str:
+    return str(_resolve_base(Path(user_selected_path)))
+
+
+def _is_primary(base: Path) -> bool:
+    game_root = load_config().get("game_root")
+    return not game_root or _resolve_base(Path(game_root)) == base
+
+
+def _original_backup_dir(base: Path) -> Path:
+    root = get_app_dir() / "backup" / "original"
+    locale_dir = base / RELATIVE_LOCALE_DIR
+    backup_dir = root / hashlib.sha256(str(locale_dir).encode("utf-8")).hexdigest()[:16]
+    if not backup_dir.exists():
+        _adopt_legacy_originals(root, backup_dir, base)
+    return backup_dir
+
+
+def _adopt_legacy_originals(root: Path, backup_dir: Path, base: Path) -> None:
+    legacy = [root / name for name in (ASSET_MAIN, ASSET_DIFF, "manifest.json") if (root / name).exists()]
+    if not legacy:
         return
-    if cfg.get("backup_done", False):
+    owner = _read_original_manifest(root).get("locale_dir")
+    if owner != str(base / RELATIVE_LOCALE_DIR) and not (owner is None and _is_primary(base)):
         return
+    backup_dir.mkdir(parents=True)
+    for p in legacy:
+        os.replace(p, backup_dir / p.name)
+
+
+def _backup_originals_once(base: Path) -> None:
+    with _backup_lock:
+        cfg = load_config()
+        if not cfg.get("backup_enabled", True):
+            return
+
+        backup_dir = _original_backup_dir(base)
+        if backup_dir.exists():
+            return
+        if cfg.get("backup_done", False) and _is_primary(base):
+            return
+        backup_dir.mkdir(parents=True)
+
+        locale_dir = base / RELATIVE_LOCALE_DIR
+        target_main = locale_dir / ASSET_MAIN
+        target_diff = locale_dir / ASSET_DIFF
+        if target_main.exists():
+            shutil.copy2(target_main, backup_dir / ASSET_MAIN)
+        if target_diff.exists():
+            shutil.copy2(target_diff, backup_dir / ASSET_DIFF)
+
+        present = [name for name in (ASSET_MAIN, ASSET_DIFF) if (backup_dir / name).exists()]
+        absent = [name for name in (ASSET_MAIN, ASSET_DIFF) if name not in present]
+        _write_original_manifest(backup_dir, present, absent, str(locale_dir))
+
+
+def _read_original_manifest(backup_dir: Path) -> dict:
+    try:
+        return json.loads((backup_dir / "manifest.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_original_manifest(backup_dir: Path, present: list[str], absent: list[str], locale_dir: str | None) -> dict:
+    files = {}
+    for name in present:
+        p = backup_dir / name
+        st = p.stat()
+        files[name] = {"sha256": sha256_file(p), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+    manifest = {"locale_dir": locale_dir, "files": files, "absent": absent}
+    tmp = backup_dir / "manifest.json.tmp"
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, backup_dir / "manifest.json")
+    return manifest
+
+
+def _stage_original(src: Path, staged: Path, entry: dict) -> None:
+    st = src.stat()
+    if st.st_size == entry["size"] and st.st_mtime_ns == entry["mtime_ns"]:
+        shutil.copyfile(src, staged)
+    elif copy_with_sha256(src, staged) != entry["sha256"]:
+        discard([staged])
+        raise ValueError(f"резервная копия {src.name} повреждена: SHA-256 не совпадает")
+    fsync_file(staged)
+
+
+def _tracker(progress: Callable[[Progress], None] | None) -> ProgressTracker | None:
+    if progress is None:
+        return None
+    tracker = ProgressTracker(progress)
+    tracker.phase(PHASE_METADATA)
+    return tracker
+
+
+def _raise_if_cancelled(cancel: threading.Event | None) -> None:
+    if cancel is not None and cancel.is_set():
+        raise DownloadCancelledError("установка отменена")
+
+
+def _set_phase(progress: ProgressTracker | None, phase: str) -> None:
+    if progress is not None:
+        progress.phase(phase)
+
+
+class StagedAsset(NamedTuple):
+    path: Path
+    source: str
+    sha256: str
+    seconds: float
+
 
-    backup_dir = get_app_dir() / "backup" / "original"
-    backup_dir.mkdir(parents=True, exist_ok=True)
+def _local_sha256(target: Path, recorded: dict | None) -> str:
+    st = target.stat()
+    if recorded and recorded.get("size") == st.st_size and recorded.get("mtime_ns") == st.st_mtime_ns:
+        return recorded["sha256"]
+    return sha256_file(target)
 
-    if target_main.exists():
-        shutil.copy2(target_main, backup_dir / ASSET_MAIN)
-    if target_diff.exists():
-        shutil.copy2(target_diff, backup_dir / ASSET_DIFF)
 
-    cfg["backup_done"] = True
-    save_config(cfg)
+def _already_installed(locale_dir: Path, names: list[str], version: str, published: dict[str, str]) -> bool:
+    cfg = load_config()
+    recorded = cfg.get("installed_hashes", {})
+    for name in names:
+        target = locale_dir / name
+        if not target.exists():
+            return False
+        expected = published.get(name)
+        if expected is None:
+            if cfg.get("installed_version") != version or name not in recorded:
+                return False
+            expected = recorded[name]["sha256"]
+        if _local_sha256(target, recorded.get(name)) != expected:
+            return False
+    return True
+
+
+def _held_in_store(locale_dir: Path, names: list[str]) -> dict[str, tuple[Path, str]]:
+    recorded = load_config().get("installed_hashes", {})
+    store = get_asset_store()
+    held = {}
+    for name in names:
+        entry = recorded.get(name)
+        target = locale_dir / name
+        if not entry or not target.exists():
+            continue
+        st = target.stat()
+        if st.st_size != entry["size"] or st.st_mtime_ns != entry["mtime_ns"]:
+            continue
+        obj = store.find(entry["sha256"])
+        if obj is not None:
+            held[name] = (obj, entry["sha256"])
+    return held
+
+
+def _record_installed(locale_dir: Path, staged: dict[str, StagedAsset], version: str) -> None:
+    hashes = {}
+    for name, item in staged.items():
+        st = (locale_dir / name).stat()
+        hashes[name] = {"sha256": item.sha256, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+    update_config(installed_version=version, installed_hashes=hashes)
+
+
+def _stage_from_delta(
+    delta_asset: dict,
+    target: Path,
+    staged: Path,
+    cancel: threading.Event | None = None,
+    progress: ProgressTracker | None = None,
+) -> str | None:
+    if not target.exists():
+        return None
+
+    delta_path = target.with_name(f".{target.name}.wwmru-delta")
+    try:
+        download_asset(
+            delta_asset,
+            str(delta_path),
+            cancel=cancel,
+            expected_sha256=asset_sha256(delta_asset),
+            progress=progress,
+            urls=sources.asset_urls(delta_asset),
+        )
+        recorded = load_config().get("installed_hashes", {}).get(target.name)
+        return apply_delta(target, delta_path, staged, base_sha256=_local_sha256(target, recorded))
+    except DownloadCancelledError:
+        raise
+    except Exception:
+        discard([staged])
+        return None
+    finally:
+        discard([delta_path])
+
+
+def _stage_asset(
+    asset: dict,
+    target: Path,
+    expected_sha256: str | None = None,
+    delta_asset: dict | None = None,
+    segmented: bool = False,
+    cancel: threading.Event | None = None,
+    progress: ProgressTracker | None = None,
+) -> tuple[Path, str, str]:
+    store = get_asset_store()
+    staged = staging_path(target)
+    cached = store.get(asset)
+    if cached is not None:
+        digest = copy_with_sha256(cached, staged)
+        if expected_sha256 is None or digest == expected_sha256:
+            fsync_file(staged)
+            return staged, SOURCE_STORE, digest
+        discard([staged])
+
+    if delta_asset is not None:
+        digest = _stage_from_delta(delta_asset, target, staged, cancel, progress)
+        if digest is not None and (expected_sha256 is None or digest == expected_sha256):
+            fsync_file(staged)
+            store.import_file(asset, staged, digest)
+            return staged, SOURCE_DELTA, digest
+        discard([staged])
+
+    digest = download_asset(
+        asset,
+        str(staged),
+        segmented=segmented,
+        cancel=cancel,
+        expected_sha256=expected_sha256,
+        progress=progress,
+        urls=sources.asset_urls(asset),
+    )
+    fsync_file(staged)
+    store.import_file(asset, staged, digest)
+    return staged, SOURCE_NETWORK, digest
+
+
+def _stage_assets(
+    assets: list[dict],
+    locale_dir: Path,
+    published: dict[str, str],
+    deltas: dict[str, dict] | None = None,
+    progress: ProgressTracker | None = None,
+    cancel: threading.Event | None = None,
+) -> dict[str, StagedAsset]:
+    cancel = cancel or threading.Event()
+    deltas = deltas or {}
+
+    def job(asset: dict) -> StagedAsset:
+        t0 = time.monotonic()
+        with span("install.stage_asset", asset=asset["name"], size=asset.get("size")) as s:
+            staged, source, digest = _stage_asset(
+                asset,
+                locale_dir / asset["name"],
+                expected_sha256=published.get(asset["name"]),
+                delta_asset=deltas.get(asset["name"]),
+                segmented=asset["name"] == ASSET_MAIN,
+                cancel=cancel,
+                progress=progress,
+            )
+            s.set(source=source)
+        return StagedAsset(staged, source, digest, time.monotonic() - t0)
+
+    results: dict[str, StagedAsset] = {}
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as ex:
+        futures = {ex.submit(job, a): a["name"] for a in assets}
+        try:
+            for fut in as_completed(futures):
+                results[futures[fut]] = fut.result()
+        except BaseException:
+            cancel.set()
+            ex.shutdown(wait=True)
+            for a in assets:
+                discard([staging_path(locale_dir / a["name"])])
+            raise
+    return results
+
+
+def _latest_release() -> dict:
+    release = release_index.latest()
+    if release is None:
+        raise LookupError("В репозитории нет опубликованных релизов.")
+    return release
 
 
 def get_latest_version() -> tuple[str, str]:
-    release = get_latest_release(OWNER, REPO)
-    version = release.get("tag_name") or release.get("name") or "unknown"
+    release = _latest_release()
+    version = release_tag(release) or "unknown"
     notes = release.get("body") or ""
     return version, notes
 
 
 def get_recent_versions(limit: int = 5) -> list[str]:
-    releases = get_recent_releases(OWNER, REPO, limit=limit)
-    tags: list[str] = []
-    for r in releases:
-        tag = r.get("tag_name") or r.get("name")
-        if tag:
-            tags.append(tag)
-    return tags[:limit]
-
-
-def install_latest(user_selected_path: str) -> tuple[bool, str, str]:
-    release = get_latest_release(OWNER, REPO)
-    version = release.get("tag_name") or release.get("name") or "unknown"
-    return _install_release(user_selected_path, release, version)
+    return [release_tag(r) for r in release_index.recent(limit)]
+
+
+def get_versions_page(offset: int = 0, limit: int = 5) -> tuple[list[str], bool]:
+    releases, more = release_index.window(offset, limit)
+    return [release_tag(r) for r in releases], more
+
+
+def get_release_by_tag(tag: str) -> dict:
+    return release_index.by_tag(tag)
+
+
+def get_cached_releases(limit: int = 5) -> dict:
+    releases = release_index.snapshot()
+    latest = first_stable(releases)
+    return {
+        "latest": release_tag(latest) if latest else None,
+        "versions": [release_tag(r) for r in releases[:limit]],
+        "fetched_at": release_index.fetched_at,
+    }
+
+
+def probe_sources() -> list[dict]:
+    latency = sources.probe()
+    result = []
+    for s in sources.ranked():
+        seconds = latency[s.name]
+        result.append({"name": s.name, "kind": s.kind, "url": s.url, "latency_ms": None if seconds is None else seconds * 1000})
+    return result
+
+
+def get_release_index_status() -> dict:
+    return {
+        "offline": release_index.offline,
+        "fetched_at": release_index.fetched_at,
+        "retry_after": release_index.retry_after,
+    }
+
+
+def install_latest(
+    user_selected_path: str,
+    progress: Callable[[Progress], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> tuple[bool, str, str]:
+    tracker = _tracker(progress)
+    release = _latest_release()
+    version = release_tag(release) or "unknown"
+    return _install_release(user_selected_path, release, version, progress=tracker, cancel=cancel)
+
+
+def install_version(
+    user_selected_path: str,
+    tag: str,
+    progress: Callable[[Progress], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> tuple[bool, str, str]:
+    tracker = _tracker(progress)
+    release = release_index.by_tag(tag)
+    version = release_tag(release) or tag
+    return _install_release(user_selected_path, release, version, progress=tracker, cancel=cancel)
+
+
+def _ensure_in_store(
+    asset: dict,
+    expected_sha256: str | None,
+    cancel: threading.Event | None,
+    rate_limit: int | None = None,
+) -> None:
+    store = get_asset_store()
+    if store.get(asset) is not None:
+        return
+    incoming = store.incoming_path(asset)
+    digest = download_asset(
+        asset,
+        str(incoming),
+        segmented=asset["name"] == ASSET_MAIN,
+        cancel=cancel,
+        expected_sha256=expected_sha256,
+        rate_limit=rate_limit,
+        urls=sources.asset_urls(asset),
+    )
+    store.add(asset, incoming, digest)
+
+
+def _download_to_store(assets: list[dict], published: dict[str, str]) -> None:
+    cancel = threading.Event()
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as ex:
+        futures = [ex.submit(_ensure_in_store, a, published.get(a["name"]), cancel) for a in assets]
+        try:
+            for fut in as_completed(futures):
+                fut.result()
+        except BaseException:
+            cancel.set()
+            raise
+
+
+def prefetch_release(
+    tag: str | None = None,
+    kbps: int = PREFETCH_KBPS,
+    cancel: threading.Event | None = None,
+) -> tuple[bool, str, str]:
+    version = tag or "unknown"
+    try:
+        release = release_index.by_tag(tag) if tag else _latest_release()
+        version = release_tag(release) or version
+        assets = [a for a in (find_asset(release, ASSET_MAIN), find_asset(release, ASSET_DIFF)) if a]
+        if not assets:
+            return False, version, f"В релизе {version} нет файла {ASSET_MAIN}"
+
+        published = release_index.checksums(release)
+        rate_limit = kbps * 1024 if kbps > 0 else None
+        for asset in assets:
+            _ensure_in_store(asset, published.get(asset["name"]), cancel, rate_limit)
+    except DownloadCancelledError:
+        return False, version, "Предварительная загрузка отменена"
+    except Exception as e:
+        return False, version, f"Ошибка предварительной загрузки: {e}"
 
+    return True, version, f"Версия {version} загружена заранее и готова к установке"
 
-def install_version(user_selected_path: str, tag: str) -> tuple[bool, str, str]:
-    release = get_release_by_tag(OWNER, REPO, tag)
-    version = release.get("tag_name") or release.get("name") or tag
-    return _install_release(user_selected_path, release, version)
 
+def install_many(
+    user_selected_paths: list[str],
+    tag: str | None = None,
+    max_workers: int = FLEET_WORKERS,
+) -> list[dict]:
+    release = release_index.by_tag(tag) if tag else _latest_release()
+    version = release_tag(release) or tag or "unknown"
+    assets = [a for a in (find_asset(release, ASSET_MAIN), find_asset(release, ASSET_DIFF)) if a]
 
-def _install_release(user_selected_path: str, release: dict, version: str) -> tuple[bool, str, str]:
+    try:
+        published = release_index.checksums(release)
+        _download_to_store(assets, published)
+    except Exception as e:
+        return [
+            {
+                "game_root": p,
+                "ok": False,
+                "version": "unknown",
+                "message": f"Ошибка загрузки: {e}",
+                "seconds": 0.0,
+                "network": is_network_error(e),
+            }
+            for p in user_selected_paths
+        ]
+
+    primary = load_config().get("game_root", "")
+    primary_base = _resolve_base(Path(primary)) if primary else None
+
+    seen: set[Path] = set()
+    targets: list[tuple[str, Path]] = []
+    for p in user_selected_paths:
+        base = _resolve_base(Path(p))
+        if base not in seen:
+            seen.add(base)
+            targets.append((p, base))
+
+    def one(target: tuple[str, Path]) -> dict:
+        path, base = target
+        if not (base / RELATIVE_LOCALE_DIR).is_dir():
+            msg = f"Папка игры не найдена: нет {RELATIVE_LOCALE_DIR} в {base}"
+            return {"game_root": path, "ok": False, "version": "unknown", "message": msg, "seconds": 0.0, "network": False}
+        t0 = time.monotonic()
+        network = False
+        try:
+            ok, v, msg = _install_release(path, release, version, published=published, record=base == primary_base)
+        except Exception as e:
+            ok, v, msg, network = False, "unknown", f"Ошибка: {e}", is_network_error(e)
+        return {"game_root": path, "ok": ok, "version": v, "message": msg, "seconds": time.monotonic() - t0, "network": network}
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as ex:
+        return list(ex.map(one, targets))
+
+
+def get_previous_version(limit: int = 30) -> str | None:
+    installed = load_config().get("installed_version")
+    tags = get_recent_versions(limit=limit)
+    if installed not in tags:
+        return None
+    i = tags.index(installed)
+    return tags[i + 1] if i + 1 < len(tags) else None
+
+
+def rollback(user_selected_path: str) -> tuple[bool, str, str]:
+    tag = get_previous_version()
+    if tag is None:
+        return False, "unknown", "Не удалось определить предыдущую версию для отката."
+    return install_version(user_selected_path, tag)
+
+
+def restore_original(user_selected_path: str) -> tuple[bool, str, str]:
     base = _resolve_base(Path(user_selected_path))
     locale_dir = base / RELATIVE_LOCALE_DIR
-    locale_dir.mkdir(parents=True, exist_ok=True)
+    with _backup_lock:
+        backup_dir = _original_backup_dir(base)
 
-    target_main = locale_dir / ASSET_MAIN
-    target_diff = locale_dir / ASSET_DIFF
+    names = [name for name in (ASSET_MAIN, ASSET_DIFF) if (backup_dir / name).exists()]
+    manifest = _read_original_manifest(backup_dir)
+    if not names and not manifest.get("absent"):
+        return False, "unknown", f"Резервная копия оригинальных файлов для этой папки игры не найдена: {locale_dir}"
 
+    primary = _is_primary(base)
     try:
-        main_asset = find_asset(release, ASSET_MAIN)
-        if not main_asset:
-            return False, version, f"В релизе {version} нет файла '{ASSET_MAIN}'."
+        if set(manifest.get("files", {})) != set(names):
+            manifest = _write_original_manifest(backup_dir, names, manifest.get("absent", []), str(locale_dir))
+
+        recorded = load_config().get("installed_hashes", {}) if primary else {}
+        changed = []
+        for name in names:
+            target = locale_dir / name
+            if not target.exists() or _local_sha256(target, recorded.get(name)) != manifest["files"][name]["sha256"]:
+                changed.append(name)
+
+        staged = {}
+        for name in changed:
+            tmp = staging_path(locale_dir / name)
+            _stage_original(backup_dir / name, tmp, manifest["files"][name])
+            staged[locale_dir / name] = tmp
+        if staged:
+            commit_files(staged)
+
+        removed = [name for name in manifest.get("absent", []) if (locale_dir / name).exists()]
+        discard(locale_dir / name for name in removed)
+    except PermissionError:
+        discard(staging_path(locale_dir / name) for name in names)
+        return False, "unknown", "Нет прав на запись в папку игры. Запусти WWMRU от администратора."
+    except Exception as e:
+        discard(staging_path(locale_dir / name) for name in names)
+        return False, "unknown", f"Ошибка: {e}"
 
-        diff_asset = find_asset(release, ASSET_DIFF)
+    if primary:
+        hashes = {}
+        for name in names:
+            st = (locale_dir / name).stat()
+            hashes[name] = {"sha256": manifest["files"][name]["sha256"], "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        update_config(installed_version="—", installed_hashes=hashes)
 
-        _backup_originals_once(target_main, target_diff)
+    if not changed and not removed:
+        return True, "—", f"Оригинальные файлы уже на месте — копирование не требуется.\nПуть: {locale_dir}"
 
-        with tempfile.TemporaryDirectory() as td:
-            td = Path(td)
+    msg = f"Оригинальные файлы восстановлены: {', '.join(changed) or '—'}\nПуть: {locale_dir}"
+    if removed:
+        msg += f"\nУдалены файлы, которых не было в оригинале: {', '.join(removed)}"
+    return True, "—", msg
 
-            tmp_main = td / ASSET_MAIN
-            download_asset(main_asset, str(tmp_main))
-            shutil.copy2(tmp_main, target_main)
 
-            installed = [ASSET_MAIN]
+def list_snapshots(user_selected_path: str | None = None) -> list[dict]:
+    if not user_selected_path:
+        return get_backup_store().list_snapshots()
+    return get_backup_store().list_snapshots(_resolve_base(Path(user_selected_path)) / RELATIVE_LOCALE_DIR)
 
-            if diff_asset:
-                tmp_diff = td / ASSET_DIFF
-                download_asset(diff_asset, str(tmp_diff))
-                shutil.copy2(tmp_diff, target_diff)
-                installed.append(ASSET_DIFF)
 
-        msg = (
-            f"Установлена версия: {version}\n"
-            f"Файлы: {', '.join(installed)}\n"
-            f"Путь: {locale_dir}"
-        )
-        if not diff_asset:
-            msg += "\n(diff отсутствует — это нормально)"
+def restore_snapshot(user_selected_path: str, snapshot_id: str) -> tuple[bool, str, str]:
+    base = _resolve_base(Path(user_selected_path))
+    locale_dir = base / RELATIVE_LOCALE_DIR
+
+    try:
+        snapshot_dir = get_backup_store().get_snapshot(snapshot_id).get("locale_dir")
+        if snapshot_dir and Path(snapshot_dir) != locale_dir:
+            return False, "unknown", f"Снимок {snapshot_id} сделан для другой папки игры: {snapshot_dir}"
+        manifest = get_backup_store().restore(snapshot_id, locale_dir)
+    except PermissionError:
+        return False, "unknown", "Нет прав на запись в папку игры. Запусти WWMRU от администратора."
+    except Exception as e:
+        return False, "unknown", f"Ошибка: {e}"
 
-        return True, version, msg
+    version = manifest.get("version") or "—"
+    if _is_primary(base):
+        hashes = {}
+        for name, entry in manifest["files"].items():
+            st = (locale_dir / name).stat()
+            hashes[name] = {"sha256": entry["sha256"], "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        update_config(installed_version=version, installed_hashes=hashes)
+
+    return True, version, (
+        f"Восстановлен снимок {snapshot_id} (версия {version})\n"
+        f"Файлы: {', '.join(manifest['files'])}\n"
+        f"Путь: {locale_dir}"
+    )
+
+
+def _find_deltas(release: dict, assets: list[dict], from_version: str | None, version: str) -> dict[str, dict]:
+    if not from_version or from_version in ("—", "unknown", version):
+        return {}
+    deltas = {}
+    for asset in assets:
+        delta = find_asset(release, delta_asset_name(asset["name"], from_version))
+        if delta:
+            deltas[asset["name"]] = delta
+    return deltas
+
+
+def _install_release(
+    user_selected_path: str,
+    release: dict,
+    version: str,
+    published: dict[str, str] | None = None,
+    record: bool = True,
+    progress: ProgressTracker | None = None,
+    cancel: threading.Event | None = None,
+) -> tuple[bool, str, str]:
+    base = _resolve_base(Path(user_selected_path))
+    locale_dir = base / RELATIVE_LOCALE_DIR
+    locale_dir.mkdir(parents=True, exist_ok=True)
 
+    try:
+        with span("install", version=version, game_root=str(base)):
+            main_asset = find_asset(release, ASSET_MAIN)
+            if not main_asset:
+                return False, version, f"В релизе {version} нет файла '{ASSET_MAIN}'."
+
+            diff_asset = find_asset(release, ASSET_DIFF)
+            assets = [main_asset, diff_asset] if diff_asset else [main_asset]
+            if published is None:
+                with span("install.checksums"):
+                    published = release_index.checksums(release)
+
+            _set_phase(progress, PHASE_VERIFY)
+            with span("install.check_local"):
+                up_to_date = _already_installed(locale_dir, [a["name"] for a in assets], version, published)
+            if up_to_date:
+                return True, version, (
+                    f"Версия {version} уже установлена, файлы совпадают — загрузка не требуется.\n"
+                    f"Путь: {locale_dir}"
+                )
+
+            _raise_if_cancelled(cancel)
+            with span("install.backup_originals"):
+                _backup_originals_once(base)
+
+            from_version = load_config().get("installed_version")
+            deltas = _find_deltas(release, assets, from_version, version)
+
+            _set_phase(progress, PHASE_DOWNLOAD)
+            t0 = time.monotonic()
+            with span("install.download", files=len(assets)) as s:
+                fetched = _stage_assets(assets, locale_dir, published, deltas, progress, cancel)
+                s.set(bytes=sum(a.get("size") or 0 for a in assets if fetched[a["name"]].source == SOURCE_NETWORK))
+            fetch_total = time.monotonic() - t0
+
+            installed = [name for name in (ASSET_MAIN, ASSET_DIFF) if name in fetched]
+            try:
+                _raise_if_cancelled(cancel)
+                _set_phase(progress, PHASE_BACKUP)
+                with span("install.snapshot") as s:
+                    held = _held_in_store(locale_dir, installed) if record else {}
+                    s.set(linked=len(held))
+                    get_backup_store().snapshot(
+                        locale_dir,
+                        installed,
+                        load_config().get("installed_version", "—") if record else "unknown",
+                        held,
+                    )
+                _raise_if_cancelled(cancel)
+                _set_phase(progress, PHASE_WRITE)
+                with span("install.commit", bytes=sum(fetched[name].path.stat().st_size for name in installed)):
+                    commit_files({locale_dir / name: fetched[name].path for name in installed})
+            except BaseException:
+                discard(staged.path for staged in fetched.values())
+                raise
+            if record:
+                _record_installed(locale_dir, fetched, version)
+
+            from_cache = [name for name in installed if fetched[name].source == SOURCE_STORE]
+            from_delta = [name for name in installed if fetched[name].source == SOURCE_DELTA]
+            verified = [name for name in installed if name in published]
+            timings = ", ".join(f"{name} {fetched[name].seconds:.1f} с" for name in installed)
+
+            msg = (
+                f"Установлена версия: {version}\n"
+                f"Файлы: {', '.join(installed)}\n"
+                f"Путь: {locale_dir}\n"
+                f"Время загрузки: {timings}; всего {fetch_total:.1f} с"
+            )
+            if not diff_asset:
+                msg += "\n(diff отсутствует — это нормально)"
+            if from_cache:
+                msg += f"\nИз локального хранилища: {', '.join(from_cache)}"
+            if from_delta:
+                msg += f"\nДельта-обновление с {from_version}: {', '.join(from_delta)}"
+            if verified:
+                msg += f"\nSHA-256 проверен: {', '.join(verified)}"
+            if release_index.offline:
+                msg += "\nНет связи с GitHub: использованы сохранённые сведения о релизе"
+
+            return True, version, msg
+
+    except DownloadCancelledError:
+        return False, "unknown", "Установка отменена, файлы игры не изменены."
     except PermissionError:
         return False, "unknown", "Нет прав на запись в папку игры. Запусти WWMRU от администратора."
     except Exception as e:
+        if is_network_error(e):
+            raise
         return False, "unknown", f"Ошибка: {e}"
@@ -1,13 +1,33 @@
+from launcher.startup import startup_timer
+
+import os
 import sys
+import time
+from concurrent.futures import Future
 from pathlib import Path
+from typing import Callable
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
-from launcher.config import load_config, save_config
-from launcher.installer import get_latest_version, get_recent_versions, install_latest, install_version
+from launcher.config import config_store, get_app_dir, load_config, update_config
+from launcher.progress import PHASE_BACKUP, PHASE_DOWNLOAD, PHASE_METADATA, PHASE_VERIFY, PHASE_WRITE, Progress
+from launcher.scheduler import BUSY_RETRY, UpdateSchedule
+from launcher.tasks import Task, TaskExecutor
 
 APP_NAME = "WWMRU"
 WIN_W, WIN_H = 1536, 864
+TASK_SHUTDOWN_TIMEOUT = 5.0
+BG_CACHE_FORMAT = "BMP"
+VERSIONS_PAGE = 15
+VERSIONS_SCROLL_MARGIN = 2
+
+PHASE_TITLES = {
+    PHASE_METADATA: "Получаю сведения о релизе…",
+    PHASE_DOWNLOAD: "Скачиваю",
+    PHASE_VERIFY: "Проверяю контрольные суммы…",
+    PHASE_BACKUP: "Сохраняю резервную копию…",
+    PHASE_WRITE: "Заменяю файлы…",
+}
 
 
 def res_path(*parts) -> Path:
@@ -22,42 +42,44 @@ class Switch(QtWidgets.QCheckBox):
     pass
 
 
-class UpdateCheckWorker(QtCore.QThread):
-    done = QtCore.Signal(bool, str, str)
+def format_progress(p: Progress) -> str:
+    title = PHASE_TITLES.get(p.phase, p.phase)
+    if p.phase != PHASE_DOWNLOAD or not p.total:
+        return title
+    mb = 1024 * 1024
+    text = f"{title}: {p.done / mb:.1f} из {p.total / mb:.1f} МБ · {p.speed / mb:.1f} МБ/с (в среднем {p.avg_speed / mb:.1f})"
+    if p.eta is not None:
+        text += f" · осталось {p.eta:.0f} с"
+    return text
 
-    def run(self):
-        try:
-            v, notes = get_latest_version()
-            self.done.emit(True, v, notes)
-        except Exception as e:
-            self.done.emit(False, "unknown", str(e))
 
+def installer_call(name: str, *args, **kwargs):
+    from launcher import installer
 
-class RecentVersionsWorker(QtCore.QThread):
-    done = QtCore.Signal(bool, list, str)
+    return getattr(installer, name)(*args, **kwargs)
 
-    def run(self):
-        try:
-            versions = get_recent_versions(limit=5)
-            self.done.emit(True, versions, "")
-        except Exception as e:
-            self.done.emit(False, [], str(e))
 
+def op_result(fut: Future) -> tuple[bool, str, str]:
+    if fut.cancelled():
+        return False, "unknown", "Операция отменена"
+    try:
+        return fut.result()
+    except Exception as e:
+        return False, "unknown", f"Ошибка: {e}"
 
-class InstallWorker(QtCore.QThread):
-    done = QtCore.Signal(bool, str, str)
 
-    def __init__(self, game_root: str, tag: str | None = None):
+class GuiDispatcher(QtCore.QObject):
+    call = QtCore.Signal(object, tuple)
+
+    def __init__(self):
         super().__init__()
-        self.game_root = game_root
-        self.tag = tag
+        self.call.connect(self._invoke)
 
-    def run(self):
-        if self.tag:
-            ok, version, msg = install_version(self.game_root, self.tag)
-        else:
-            ok, version, msg = install_latest(self.game_root)
-        self.done.emit(ok, version, msg)
+    def _invoke(self, fn, args: tuple):
+        fn(*args)
+
+    def post(self, fn, *args):
+        self.call.emit(fn, args)
 
 
 class WWMRUWindow(QtWidgets.QMainWindow):
@@ -69,19 +91,33 @@ class WWMRUWindow(QtWidgets.QMainWindow):
 
         self.cfg = load_config()
         self.latest_version = None
+        self.prefetched_version = None
+
+        self.tasks = TaskExecutor()
+        self.gui = GuiDispatcher()
+        self.install_task: Task | None = None
+        self.prefetch_task: Task | None = None
+        self.game_tasks: list[Task] = []
+
+        self.schedule = UpdateSchedule(int(self.cfg.get("check_interval_min", 30)) * 60)
+        self.check_timer = QtCore.QTimer(self)
+        self.check_timer.setSingleShot(True)
+        self.check_timer.timeout.connect(self._scheduled_check)
 
         qss_path = res_path("style.qss")
         if qss_path.exists():
             self.setStyleSheet(qss_path.read_text(encoding="utf-8"))
+        startup_timer.mark("window.style")
 
         root = QtWidgets.QWidget()
         self.setCentralWidget(root)
 
         self.bg = QtWidgets.QLabel(root)
         self.bg.setGeometry(0, 0, WIN_W, WIN_H)
-        self._bg_pix = QtGui.QPixmap(str(res_path("bg.png")))
+        self._bg_size = None
         self._apply_background()
         self.bg.lower()
+        startup_timer.mark("window.background")
 
         self.shell = QtWidgets.QFrame(root)
         self.shell.setObjectName("Shell")
@@ -162,26 +198,56 @@ class WWMRUWindow(QtWidgets.QMainWindow):
         self.page_settings = self._build_settings_page()
         self.stack.addWidget(self.page_install)
         self.stack.addWidget(self.page_settings)
+        startup_timer.mark("window.widgets")
 
         self._drag_offset = None
 
         self.tray = None
         self._init_tray()
+        startup_timer.mark("window.tray")
 
-        QtCore.QTimer.singleShot(120, self.check_updates)
-        QtCore.QTimer.singleShot(200, self.load_recent_versions)
+        QtCore.QTimer.singleShot(120, self.load_cached_releases)
+
+    def _bg_cache_path(self, width: int, height: int) -> Path | None:
+        try:
+            st = res_path("bg.png").stat()
+        except OSError:
+            return None
+        return get_app_dir() / "cache" / f"bg-{width}x{height}-{st.st_size}-{st.st_mtime_ns}.bmp"
+
+    def _save_bg_cache(self, pix: QtGui.QPixmap, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for old in path.parent.glob("bg-*.bmp"):
+            old.unlink(missing_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        if pix.save(str(tmp), BG_CACHE_FORMAT):
+            os.replace(tmp, path)
 
     def _apply_background(self):
-        if self._bg_pix.isNull():
+        size = (self.width(), self.height())
+        if size == self._bg_size:
             return
-        self.bg.setPixmap(
-            self._bg_pix.scaled(
-                self.width(),
-                self.height(),
-                QtCore.Qt.IgnoreAspectRatio,
-                QtCore.Qt.SmoothTransformation,
-            )
-        )
+
+        cache = self._bg_cache_path(*size)
+        pix = QtGui.QPixmap()
+        if cache is not None and cache.exists():
+            pix.load(str(cache), BG_CACHE_FORMAT)
+        if pix.isNull():
+            src = QtGui.QPixmap(str(res_path("bg.png")))
+            if src.isNull():
+                return
+            pix = src.scaled(*size, QtCore.Qt.IgnoreAspectRatio, QtCore.Qt.SmoothTransformation)
+            if cache is not None:
+                QtCore.QTimer.singleShot(0, lambda: self._save_bg_cache(pix, cache))
+
+        self._bg_size = size
+        self.bg.setPixmap(pix)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if startup_timer.enabled:
+            startup_timer.mark("paint")
+            QtCore.QTimer.singleShot(0, startup_timer.finish)
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
@@ -229,9 +295,47 @@ class WWMRUWindow(QtWidgets.QMainWindow):
         if self.tray:
             self.tray.showMessage("WWMRU", "Свернуто в трей", QtWidgets.QSystemTrayIcon.Information, 1200)
 
+    def _submit(self, fn, *args, on_done: Callable[[Future], None], **kwargs) -> Task:
+        task = self.tasks.submit(
+            fn, *args, on_done=lambda fut: self.gui.post(self._task_finished, on_done, fut), **kwargs
+        )
+        self._update_task_status()
+        return task
+
+    def _task_finished(self, on_done: Callable[[Future], None], fut: Future):
+        self._update_task_status()
+        on_done(fut)
+
+    def _submit_game_op(self, name: str, game_root: str, *args, on_done: Callable[..., None], **kwargs) -> Task:
+        root = installer_call("resolve_game_root", game_root)
+        task = self._submit(
+            installer_call,
+            name,
+            game_root,
+            *args,
+            key=f"{name}:{root}:{args}",
+            serial=root,
+            on_done=lambda fut: on_done(*op_result(fut)),
+            **kwargs,
+        )
+        self.game_tasks = [t for t in self.game_tasks if not t.future.done()] + [task]
+        return task
+
+    def _update_task_status(self):
+        if not self.tray:
+            return
+        active, queued = self.tasks.active_count, self.tasks.queued_count
+        if active or queued:
+            self.tray.setToolTip(f"WWMRU — задач: {active} выполняется, {queued} в очереди")
+        else:
+            self.tray.setToolTip("WWMRU")
+
     def _exit_app(self):
+        self.check_timer.stop()
+        self.tasks.shutdown(timeout=TASK_SHUTDOWN_TIMEOUT)
         if self.tray:
             self.tray.hide()
+        config_store.flush()
         QtWidgets.QApplication.quit()
 
     def _build_install_page(self) -> QtWidgets.QWidget:
@@ -295,6 +399,12 @@ class WWMRUWindow(QtWidgets.QMainWindow):
         self.btnInstall.clicked.connect(self.on_install_latest)
         card_l.addWidget(self.btnInstall)
 
+        self.progressBar = QtWidgets.QProgressBar()
+        self.progressBar.setObjectName("Progress")
+        self.progressBar.setTextVisible(False)
+        self.progressBar.hide()
+        card_l.addWidget(self.progressBar)
+
         self.lblStatus = QtWidgets.QLabel("")
         self.lblStatus.setObjectName("StatusText")
         card_l.addWidget(self.lblStatus)
@@ -332,6 +442,25 @@ class WWMRUWindow(QtWidgets.QMainWindow):
         row1.addWidget(self.swBackup)
         card_l.addLayout(row1)
 
+        row2 = QtWidgets.QHBoxLayout()
+        t2 = QtWidgets.QVBoxLayout()
+        a2 = QtWidgets.QLabel("Загружать обновления заранее")
+        a2.setObjectName("RowTitle")
+        b2 = QtWidgets.QLabel(
+            f"Скачивать новую версию в фоне (до {self.cfg.get('prefetch_kbps', 1024)} КБ/с), установка займёт секунду"
+        )
+        b2.setObjectName("RowSub")
+        t2.addWidget(a2)
+        t2.addWidget(b2)
+        row2.addLayout(t2, 1)
+
+        self.swPrefetch = Switch()
+        self.swPrefetch.setObjectName("Switch")
+        self.swPrefetch.setChecked(bool(self.cfg.get("prefetch_enabled", False)))
+        self.swPrefetch.stateChanged.connect(self.on_prefetch_toggle)
+        row2.addWidget(self.swPrefetch)
+        card_l.addLayout(row2)
+
         line = QtWidgets.QFrame()
         line.setObjectName("Divider")
         card_l.addWidget(line)
@@ -345,6 +474,8 @@ class WWMRUWindow(QtWidgets.QMainWindow):
 
         self.cmbVersions = QtWidgets.QComboBox()
         self.cmbVersions.setObjectName("Input")
+        self.cmbVersions.activated.connect(self.on_version_activated)
+        self.cmbVersions.view().verticalScrollBar().valueChanged.connect(self.on_versions_scrolled)
 
         self.btnInstallSelected = QtWidgets.QPushButton("Установить выбранную")
         self.btnInstallSelected.setObjectName("GhostBtn")
@@ -358,6 +489,30 @@ class WWMRUWindow(QtWidgets.QMainWindow):
         self.lblRollbackStatus.setObjectName("InfoText2")
         card_l.addWidget(self.lblRollbackStatus)
 
+        line_restore = QtWidgets.QFrame()
+        line_restore.setObjectName("Divider")
+        card_l.addWidget(line_restore)
+
+        rs_row = QtWidgets.QHBoxLayout()
+        rs_text = QtWidgets.QVBoxLayout()
+        rs_title = QtWidgets.QLabel("Оригинальные файлы")
+        rs_title.setObjectName("RowTitle")
+        rs_sub = QtWidgets.QLabel("Вернуть файлы игры из резервной копии")
+        rs_sub.setObjectName("RowSub")
+        rs_text.addWidget(rs_title)
+        rs_text.addWidget(rs_sub)
+        rs_row.addLayout(rs_text, 1)
+
+        self.btnRestoreOriginal = QtWidgets.QPushButton("Восстановить")
+        self.btnRestoreOriginal.setObjectName("GhostBtn")
+        self.btnRestoreOriginal.clicked.connect(self.on_restore_original)
+        rs_row.addWidget(self.btnRestoreOriginal)
+        card_l.addLayout(rs_row)
+
+        self.lblRestoreStatus = QtWidgets.QLabel("")
+        self.lblRestoreStatus.setObjectName("InfoText2")
+        card_l.addWidget(self.lblRestoreStatus)
+
         line2 = QtWidgets.QFrame()
         line2.setObjectName("Divider")
         card_l.addWidget(line2)
@@ -383,33 +538,113 @@ class WWMRUWindow(QtWidgets.QMainWindow):
     def on_tab_changed(self, idx: int):
         self.stack.setCurrentIndex(idx)
 
+    def _set_cfg(self, **values):
+        self.cfg.update(values)
+        update_config(**values)
+
     def on_backup_toggle(self, _state: int):
-        self.cfg["backup_enabled"] = bool(self.swBackup.isChecked())
-        save_config(self.cfg)
+        self._set_cfg(backup_enabled=bool(self.swBackup.isChecked()))
+
+    def on_prefetch_toggle(self, _state: int):
+        enabled = bool(self.swPrefetch.isChecked())
+        self._set_cfg(prefetch_enabled=enabled)
+        if not enabled:
+            self._stop_prefetch()
+        elif self.latest_version and self.latest_version != self.cfg.get("installed_version", "—"):
+            self._start_prefetch(self.latest_version)
+
+    def _start_prefetch(self, tag: str):
+        if not self.cfg.get("prefetch_enabled", False) or tag == self.prefetched_version:
+            return
+
+        self.prefetch_task = self._submit(
+            installer_call,
+            "prefetch_release",
+            tag,
+            kbps=int(self.cfg.get("prefetch_kbps", 1024)),
+            key=f"prefetch:{tag}",
+            cancellable=True,
+            on_done=lambda fut: self.on_prefetch_done(*op_result(fut)),
+        )
+
+    def _stop_prefetch(self):
+        if self.prefetch_task is not None:
+            self.prefetch_task.cancel.set()
+
+    def on_prefetch_done(self, ok: bool, version: str, message: str):
+        if not ok:
+            return
+        self.prefetched_version = version
+        if version == self.latest_version:
+            self.lblStatus.setText(f"Доступна версия: {version} (уже загружена)")
+        if self.tray:
+            self.tray.showMessage("WWMRU", message, QtWidgets.QSystemTrayIcon.Information, 2200)
 
     def on_pick_folder(self):
         d = QtWidgets.QFileDialog.getExistingDirectory(self, "Выбери папку игры (или папку уровнем выше)")
         if d:
             self.editGame.setText(d)
-            self.cfg["game_root"] = d
-            save_config(self.cfg)
+            self._set_cfg(game_root=d)
+
+    def _busy(self) -> bool:
+        return any(not t.future.done() for t in self.game_tasks)
+
+    def _schedule_next_check(self, delay: float):
+        if self.schedule.enabled:
+            self.check_timer.start(int(delay * 1000))
+
+    def _scheduled_check(self):
+        if self._busy():
+            self._schedule_next_check(BUSY_RETRY)
+            return
+        self.check_updates()
+
+    def load_cached_releases(self):
+        self._submit(installer_call, "get_cached_releases", limit=VERSIONS_PAGE, key="cached-releases", on_done=self.on_cached_releases_loaded)
+
+    def on_cached_releases_loaded(self, fut: Future):
+        if fut.cancelled():
+            return
+        try:
+            cached = fut.result()
+        except Exception:
+            cached = {}
+
+        if cached.get("versions"):
+            self._fill_versions_combo(cached["versions"])
+        if cached.get("latest") and self.latest_version is None:
+            self.lblStatus.setText(f"Последняя известная версия: {cached['latest']}. Проверяю обновления…")
+
+        self.check_updates()
+        self.load_recent_versions()
 
     def check_updates(self):
+        self.check_timer.stop()
         self.btnRefresh.setEnabled(False)
         self.btnRefresh.setText("Проверяю…")
-        self.worker = UpdateCheckWorker()
-        self.worker.done.connect(self.on_update_check_done)
-        self.worker.start()
+        self._submit(installer_call, "get_latest_version", key="check", on_done=self.on_update_check_done)
 
-    def on_update_check_done(self, ok: bool, latest_version: str, notes_or_error: str):
+    def on_update_check_done(self, fut: Future):
         self.btnRefresh.setEnabled(True)
         self.btnRefresh.setText("Обновить")
+        if fut.cancelled():
+            return
 
-        if not ok:
+        try:
+            latest_version, _notes = fut.result()
+        except Exception as e:
+            retry_after = getattr(e, "retry_after", None)
+            self._schedule_next_check(self.schedule.failure(retry_after))
             self.latest_version = None
-            self.lblStatus.setText(f"Не удалось проверить обновления: {notes_or_error}")
+            self.lblStatus.setText(f"Не удалось проверить обновления: {e}")
             return
 
+        status = installer_call("get_release_index_status")
+        if status["offline"]:
+            self._schedule_next_check(self.schedule.failure(status["retry_after"]))
+        else:
+            self._schedule_next_check(self.schedule.success())
+        notify = latest_version != self.latest_version
         self.latest_version = latest_version
         installed = self.cfg.get("installed_version", "—")
 
@@ -419,33 +654,95 @@ class WWMRUWindow(QtWidgets.QMainWindow):
         else:
             self.btnInstall.setText(f"Установить версию {latest_version}")
             self.lblStatus.setText(f"Доступна версия: {latest_version}")
-            if self.tray:
+            if self.tray and notify:
                 self.tray.showMessage("WWMRU", f"Доступна версия {latest_version}", QtWidgets.QSystemTrayIcon.Information, 2200)
+            self._start_prefetch(latest_version)
+
+        if status["offline"]:
+            fetched = time.strftime("%d.%m.%Y %H:%M", time.localtime(status["fetched_at"]))
+            self.lblStatus.setText(f"{self.lblStatus.text()}\nНет связи с GitHub, данные от {fetched}")
 
     def load_recent_versions(self):
-        self.vers_worker = RecentVersionsWorker()
-        self.vers_worker.done.connect(self.on_recent_versions_loaded)
-        self.vers_worker.start()
+        self._submit(
+            installer_call,
+            "get_versions_page",
+            0,
+            VERSIONS_PAGE,
+            key="recent-versions",
+            on_done=self.on_recent_versions_loaded,
+        )
 
-    def on_recent_versions_loaded(self, ok: bool, versions: list, error: str):
-        if not ok:
-            self.lblRollbackStatus.setText(f"Не удалось загрузить релизы: {error}")
+    def on_recent_versions_loaded(self, fut: Future):
+        if fut.cancelled():
+            return
+        try:
+            versions, more = fut.result()
+        except Exception as e:
+            self.lblRollbackStatus.setText(f"Не удалось загрузить релизы: {e}")
             return
 
-        self.cfg["recent_versions"] = versions[:5]
-        save_config(self.cfg)
-        self._fill_versions_combo(self.cfg["recent_versions"])
+        self._set_cfg(recent_versions=versions[:5])
+        self._fill_versions_combo(versions, more)
         self.lblRollbackStatus.setText("")
 
-    def _fill_versions_combo(self, versions: list):
+    def load_more_versions(self):
+        if not self.versions_more:
+            return
+        self.cmbVersions.setItemText(self.cmbVersions.count() - 1, "Загружаю…")
+        self._submit(
+            installer_call,
+            "get_versions_page",
+            len(self.versions),
+            VERSIONS_PAGE,
+            key="more-versions",
+            on_done=self.on_more_versions_loaded,
+        )
+
+    def on_more_versions_loaded(self, fut: Future):
+        if fut.cancelled() or not self.versions_more:
+            return
+        try:
+            versions, more = fut.result()
+        except Exception as e:
+            self.cmbVersions.setItemText(self.cmbVersions.count() - 1, "Показать более ранние версии…")
+            self.lblRollbackStatus.setText(f"Не удалось загрузить релизы: {e}")
+            return
+
         self.cmbVersions.blockSignals(True)
-        self.cmbVersions.clear()
+        self.cmbVersions.removeItem(self.cmbVersions.count() - 1)
+        self._add_versions([v for v in versions if v not in self.versions])
+        self.versions_more = more
+        if more:
+            self.cmbVersions.addItem("Показать более ранние версии…", "")
+        self.cmbVersions.blockSignals(False)
+
+    def on_versions_scrolled(self, value: int):
+        bar = self.cmbVersions.view().verticalScrollBar()
+        if value >= bar.maximum() - VERSIONS_SCROLL_MARGIN:
+            self.load_more_versions()
+
+    def on_version_activated(self, index: int):
+        if self.versions_more and index == self.cmbVersions.count() - 1:
+            self.cmbVersions.setCurrentIndex(index - 1)
+            self.load_more_versions()
+
+    def _add_versions(self, versions: list):
         current = self.cfg.get("installed_version", "—")
+        for v in versions:
+            label = f"{v} (установлено)" if v == current else v
+            self.cmbVersions.addItem(label, v)
+        self.versions.extend(versions)
+
+    def _fill_versions_combo(self, versions: list, more: bool = False):
+        self.cmbVersions.blockSignals(True)
+        self.cmbVersions.clear()
+        self.versions = []
+        self.versions_more = bool(versions) and more
 
         if versions:
-            for v in versions[:5]:
-                label = f"{v} (установлено)" if v == current else v
-                self.cmbVersions.addItem(label, v)
+            self._add_versions(versions)
+            if self.versions_more:
+                self.cmbVersions.addItem("Показать более ранние версии…", "")
         else:
             self.cmbVersions.addItem("Нет данных", "")
 
@@ -455,21 +752,33 @@ class WWMRUWindow(QtWidgets.QMainWindow):
         return self.editGame.text().strip()
 
     def on_install_latest(self):
+        if self.install_task is not None and not self.install_task.future.done():
+            self.install_task.cancel.set()
+            self.btnInstall.setEnabled(False)
+            self.btnInstall.setText("Отменяю…")
+            return
+
         game_root = self._get_game_root()
         if not game_root:
             self.lblStatus.setText("Укажи папку игры.")
             return
 
-        self.cfg["game_root"] = game_root
-        save_config(self.cfg)
+        self._set_cfg(game_root=game_root)
+        self._stop_prefetch()
 
-        self.btnInstall.setEnabled(False)
-        self.btnInstall.setText("Устанавливаю…")
+        self.btnInstall.setText("Отменить установку")
         self.lblStatus.setText("Скачиваю и заменяю файлы…")
 
-        self.inst_worker = InstallWorker(game_root, tag=None)
-        self.inst_worker.done.connect(self.on_install_done)
-        self.inst_worker.start()
+        self.progressBar.setRange(0, 0)
+        self.progressBar.show()
+
+        self.install_task = self._submit_game_op(
+            "install_latest",
+            game_root,
+            progress=lambda p: self.gui.post(self.on_install_progress, p),
+            cancellable=True,
+            on_done=self.on_install_done,
+        )
 
     def on_install_selected(self):
         game_root = self._get_game_root()
@@ -482,31 +791,64 @@ class WWMRUWindow(QtWidgets.QMainWindow):
             self.lblRollbackStatus.setText("Не выбрана версия.")
             return
 
+        self._stop_prefetch()
         self.btnInstallSelected.setEnabled(False)
         self.lblRollbackStatus.setText(f"Устанавливаю {tag}…")
 
-        self.rb_worker = InstallWorker(game_root, tag=str(tag))
-        self.rb_worker.done.connect(self.on_rollback_done)
-        self.rb_worker.start()
+        self._submit_game_op(
+            "install_version",
+            game_root,
+            str(tag),
+            progress=lambda p: self.gui.post(self.lblRollbackStatus.setText, format_progress(p)),
+            cancellable=True,
+            on_done=self.on_rollback_done,
+        )
 
     def on_rollback_done(self, ok: bool, version: str, message: str):
         self.btnInstallSelected.setEnabled(True)
         self.lblRollbackStatus.setText(message)
         if ok:
-            self.cfg["installed_version"] = version
-            save_config(self.cfg)
+            self.cfg = load_config()
             self.lblVersion.setText(f"Текущая версия: {version}")
-            self._fill_versions_combo(self.cfg.get("recent_versions", []))
+            self._fill_versions_combo(list(self.versions), self.versions_more)
             self.check_updates()
 
+    def on_restore_original(self):
+        game_root = self._get_game_root()
+        if not game_root:
+            self.lblRestoreStatus.setText("Укажи папку игры на вкладке «Установка».")
+            return
+
+        self.btnRestoreOriginal.setEnabled(False)
+        self.lblRestoreStatus.setText("Восстанавливаю оригинальные файлы…")
+
+        self._submit_game_op("restore_original", game_root, on_done=self.on_restore_done)
+
+    def on_restore_done(self, ok: bool, version: str, message: str):
+        self.btnRestoreOriginal.setEnabled(True)
+        self.lblRestoreStatus.setText(message)
+        if ok:
+            self.cfg = load_config()
+            self.lblVersion.setText(f"Текущая версия: {version}")
+            self._fill_versions_combo(list(self.versions), self.versions_more)
+            self.check_updates()
+
+    def on_install_progress(self, p: Progress):
+        if p.phase == PHASE_DOWNLOAD and p.total:
+            self.progressBar.setRange(0, 1000)
+            self.progressBar.setValue(min(1000, p.done * 1000 // p.total))
+        elif p.phase != PHASE_DOWNLOAD:
+            self.progressBar.setRange(0, 0)
+        self.lblStatus.setText(format_progress(p))
+
     def on_install_done(self, ok: bool, version: str, message: str):
+        self.progressBar.hide()
         self.btnInstall.setEnabled(True)
         self.btnInstall.setText("Установить русификатор")
         self.lblStatus.setText(message)
 
         if ok:
-            self.cfg["installed_version"] = version
-            save_config(self.cfg)
+            self.cfg = load_config()
             self.lblVersion.setText(f"Текущая версия: {version}")
             if self.tray:
                 self.tray.showMessage("WWMRU", f"Установлена версия {version}", QtWidgets.QSystemTrayIcon.Information, 2200)
@@ -529,12 +871,15 @@ class WWMRUWindow(QtWidgets.QMainWindow):
 
 
 def main():
+    startup_timer.mark("imports")
     app = QtWidgets.QApplication(sys.argv)
     icon_path = res_path("wwmru.ico")
     if icon_path.exists():
         app.setWindowIcon(QtGui.QIcon(str(icon_path)))
+    startup_timer.mark("qapplication")
     w = WWMRUWindow()
     w.show()
+    startup_timer.mark("show")
     sys.exit(app.exec())
 
 
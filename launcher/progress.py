@@ -0,0 +1,81 @@
+import threading
+import time
+from typing import Callable, NamedTuple
+
+PROGRESS_INTERVAL = 0.1
+SPEED_SMOOTHING = 0.3
+
+PHASE_METADATA = "metadata"
+PHASE_DOWNLOAD = "download"
+PHASE_VERIFY = "verify"
+PHASE_BACKUP = "backup"
+PHASE_WRITE = "write"
+
+
+class Progress(NamedTuple):
+    phase: str
+    done: int
+    total: int | None
+    speed: float
+    avg_speed: float
+
+    @property
+    def eta(self) -> float | None:
+        rate = self.speed or self.avg_speed
+        if not self.total or rate <= 0:
+            return None
+        return max(0.0, (self.total - self.done) / rate)
+
+
+class ProgressTracker:
+    def __init__(self, callback: Callable[[Progress], None], interval: float = PROGRESS_INTERVAL):
+        self.callback = callback
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._phase = PHASE_METADATA
+        self._done: dict[str, int] = {}
+        self._base: dict[str, int] = {}
+        self._totals: dict[str, int] = {}
+        self._started: float | None = None
+        self._last_emit = 0.0
+        self._last_done = 0
+        self._speed = 0.0
+
+    def phase(self, name: str) -> None:
+        with self._lock:
+            self._phase = name
+            snapshot = self._snapshot(time.monotonic())
+        self.callback(snapshot)
+
+    def expect(self, key: str, total: int | None) -> None:
+        if total:
+            with self._lock:
+                self._totals[key] = total
+
+    def update(self, key: str, done: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if self._started is None:
+                self._started = now
+            if key not in self._base:
+                self._base[key] = done
+                self._last_done += done
+            self._done[key] = done
+            if now - self._last_emit < self.interval and done != self._totals.get(key):
+                return
+            snapshot = self._snapshot(now)
+        self.callback(snapshot)
+
+    def _snapshot(self, now: float) -> Progress:
+        done = sum(self._done.values())
+        if self._last_emit:
+            instant = (done - self._last_done) / max(now - self._last_emit, 1e-6)
+            self._speed = instant if not self._speed else self._speed + SPEED_SMOOTHING * (instant - self._speed)
+        self._last_emit = now
+        self._last_done = done
+
+        fresh = done - sum(self._base.values())
+        elapsed = now - self._started if self._started is not None else 0.0
+        avg = fresh / elapsed if elapsed > 0 else 0.0
+        total = sum(self._totals.values()) or None
+        return Progress(self._phase, done, total, max(0.0, self._speed), max(0.0, avg))
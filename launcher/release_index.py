@@ -0,0 +1,254 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+from launcher.config import get_app_dir
+from launcher.github_api import get_release_checksums
+from launcher.sources import SourceSet
+from launcher.tracing import span
+
+INDEX_PAGE_SIZE = 30
+INDEX_MAX_AGE = 60
+
+_ASSET_FIELDS = ("id", "name", "size", "digest", "browser_download_url", "updated_at")
+_RELEASE_FIELDS = ("tag_name", "name", "body", "published_at", "created_at", "prerelease", "draft")
+
+
+def _slim_release(release: dict) -> dict:
+    tag = release_tag(release)
+    slim = {k: release.get(k) for k in _RELEASE_FIELDS}
+    slim["assets"] = [dict({k: a.get(k) for k in _ASSET_FIELDS}, tag=tag) for a in release.get("assets", [])]
+    return slim
+
+
+def release_tag(release: dict) -> str | None:
+    return release.get("tag_name") or release.get("name")
+
+
+def first_stable(releases: list[dict]) -> dict | None:
+    for r in releases:
+        if not r.get("prerelease"):
+            return r
+    return None
+
+
+class ReleaseIndex:
+    def __init__(
+        self,
+        owner: str,
+        repo: str,
+        path: Path | None = None,
+        max_age: float = INDEX_MAX_AGE,
+        sources: SourceSet | None = None,
+    ):
+        self.owner = owner
+        self.repo = repo
+        self.sources = sources or SourceSet(owner, repo)
+        self.path = path
+        self.max_age = max_age
+        self.releases: list[dict] = []
+        self.fetched_at = 0.0
+        self.next_page: str | None = None
+        self.complete = False
+        self.offline = False
+        self.retry_after: float | None = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._more_lock = threading.Lock()
+        self._inflight: Future | None = None
+
+    def _index_path(self) -> Path:
+        if self.path is None:
+            self.path = get_app_dir() / "releases.json"
+        return self.path
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            data = json.loads(self._index_path().read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        self.releases = data.get("releases", [])
+        self.fetched_at = data.get("fetched_at", 0.0)
+        self.next_page = data.get("next_page")
+        self.complete = data.get("complete", False)
+
+    def _save(self) -> None:
+        p = self._index_path()
+        tmp = p.with_suffix(".tmp")
+        data = {
+            "fetched_at": self.fetched_at,
+            "next_page": self.next_page,
+            "complete": self.complete,
+            "releases": self.releases,
+        }
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, p)
+
+    def _merge(self, releases: list[dict]) -> None:
+        by_tag = {release_tag(r): r for r in self.releases}
+        for r in releases:
+            if r.get("draft"):
+                continue
+            slim = _slim_release(r)
+            old = by_tag.get(release_tag(r))
+            if old and old.get("checksums") is not None and old["assets"] == slim["assets"]:
+                slim["checksums"] = old["checksums"]
+            by_tag[release_tag(r)] = slim
+        self.releases = sorted(
+            (r for tag, r in by_tag.items() if tag),
+            key=lambda r: r.get("published_at") or r.get("created_at") or "",
+            reverse=True,
+        )
+
+    def _find(self, tag: str | None) -> dict | None:
+        for r in self.releases:
+            if release_tag(r) == tag:
+                return r
+        return None
+
+    def _known(self) -> set[str]:
+        return {release_tag(r) for r in self.releases}
+
+    def _fetch_new(self, known: set[str]) -> tuple[list[dict], str | None]:
+        fetched: list[dict] = []
+        next_page = None
+        for page, next_page in self.sources.iter_release_pages(INDEX_PAGE_SIZE):
+            fetched.extend(page)
+            if not known or any(release_tag(r) in known for r in page):
+                break
+        return fetched, next_page
+
+    def snapshot(self) -> list[dict]:
+        with self._lock:
+            self._load()
+            return list(self.releases)
+
+    def refresh(self, force: bool = False) -> list[dict]:
+        with self._lock:
+            self._load()
+            if not force and self.releases and time.time() - self.fetched_at < self.max_age:
+                return list(self.releases)
+            if self._inflight is not None:
+                fut = self._inflight
+                leader = False
+            else:
+                fut = self._inflight = Future()
+                leader = True
+            known = self._known()
+
+        if not leader:
+            return fut.result()
+
+        try:
+            try:
+                with span("index.refresh", known=len(known)) as s:
+                    fetched, next_page = self._fetch_new(known)
+                    s.set(fetched=len(fetched))
+            except OSError as e:
+                with self._lock:
+                    if not self.releases:
+                        raise
+                    self.offline = True
+                    self.retry_after = getattr(e, "retry_after", None)
+                    result = list(self.releases)
+                fut.set_result(result)
+                return result
+            with self._lock:
+                self._merge(fetched)
+                if not known or next_page is None:
+                    self.next_page = next_page
+                    self.complete = next_page is None
+                self.fetched_at = time.time()
+                self.offline = False
+                self.retry_after = None
+                self._save()
+                result = list(self.releases)
+            fut.set_result(result)
+            return result
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight = None
+
+    def latest(self) -> dict | None:
+        return first_stable(self.refresh())
+
+    def load_more(self) -> int:
+        with self._more_lock:
+            with self._lock:
+                self._load()
+                if self.complete:
+                    return 0
+                url = self.next_page
+                known = self._known()
+
+            added = 0
+            next_page = None
+            with span("index.load_more", known=len(known)) as s:
+                for page, next_page in self.sources.iter_release_pages(INDEX_PAGE_SIZE, url):
+                    fresh = [r for r in page if release_tag(r) not in known and not r.get("draft")]
+                    with self._lock:
+                        self._merge(fresh)
+                    added += len(fresh)
+                    if added:
+                        break
+                s.set(fetched=added)
+
+            with self._lock:
+                self.next_page = next_page
+                self.complete = next_page is None
+                self._save()
+            return added
+
+    def window(self, offset: int, limit: int) -> tuple[list[dict], bool]:
+        releases = self.refresh()
+        while len(releases) < offset + limit and not self.complete:
+            try:
+                if not self.load_more():
+                    break
+            except OSError as e:
+                self.offline = True
+                self.retry_after = getattr(e, "retry_after", None)
+                break
+            releases = self.snapshot()
+        return releases[offset:offset + limit], len(releases) > offset + limit or not self.complete
+
+    def recent(self, limit: int = 5) -> list[dict]:
+        return self.window(0, limit)[0]
+
+    def by_tag(self, tag: str) -> dict:
+        self.refresh()
+        with self._lock:
+            cached = self._find(tag)
+        if cached is not None:
+            return cached
+
+        release = self.sources.get_release_by_tag(tag)
+        with self._lock:
+            self._merge([release])
+            self._save()
+        return _slim_release(release)
+
+    def checksums(self, release: dict) -> dict[str, str]:
+        tag = release_tag(release)
+        with self._lock:
+            self._load()
+            cached = self._find(tag)
+            if cached is not None and cached.get("checksums") is not None:
+                return dict(cached["checksums"])
+
+        checksums = get_release_checksums(release, self.sources.asset_urls)
+        with self._lock:
+            cached = self._find(tag)
+            if cached is not None:
+                cached["checksums"] = checksums
+                self._save()
+        return dict(checksums)
@@ -0,0 +1,32 @@
+import random
+
+CHECK_JITTER = 0.1
+MAX_BACKOFF = 6 * 60 * 60
+BUSY_RETRY = 60
+ERROR_RETRY = 60
+
+
+class UpdateSchedule:
+    def __init__(self, interval: float, jitter: float = CHECK_JITTER, max_backoff: float = MAX_BACKOFF):
+        self.interval = interval
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    def _jittered(self, delay: float) -> float:
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def success(self) -> float:
+        self.failures = 0
+        return self._jittered(self.interval)
+
+    def failure(self, retry_after: float | None = None) -> float:
+        self.failures += 1
+        delay = self._jittered(min(self.max_backoff, ERROR_RETRY * 2 ** self.failures))
+        if retry_after is not None:
+            delay = max(delay, retry_after + random.uniform(0, ERROR_RETRY))
+        return delay
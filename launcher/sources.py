@@ -0,0 +1,205 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator
+from urllib.parse import quote
+
+import requests
+
+from launcher import github_api
+from launcher.config import load_config
+from launcher.http_client import get_client
+
+SOURCE_GITHUB = "github"
+SOURCE_HTTP = "http"
+SOURCE_LOCAL = "local"
+
+DEFAULT_SOURCES = [{"type": SOURCE_GITHUB}]
+GITHUB_DOWNLOAD = "https://github.com"
+MANIFEST_NAME = "releases.json"
+
+PROBE_TIMEOUT = 3.0
+PROBE_TTL = 300
+
+
+class Source(ABC):
+    kind = ""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+
+    @property
+    def name(self) -> str:
+        return f"{self.kind}:{self.url}"
+
+    def owns(self, url: str) -> bool:
+        return url.startswith(self.url + "/")
+
+    @abstractmethod
+    def probe_url(self) -> str:
+        ...
+
+    def probe(self) -> float | None:
+        t0 = time.monotonic()
+        try:
+            r = get_client().session.head(self.probe_url(), timeout=PROBE_TIMEOUT, allow_redirects=True)
+        except requests.RequestException:
+            return None
+        if not r.ok:
+            return None
+        return time.monotonic() - t0
+
+    @abstractmethod
+    def iter_release_pages(
+        self, owner: str, repo: str, per_page: int, url: str | None = None
+    ) -> Iterator[tuple[list[dict], str | None]]:
+        ...
+
+    @abstractmethod
+    def get_release_by_tag(self, owner: str, repo: str, tag: str) -> dict:
+        ...
+
+    @abstractmethod
+    def asset_url(self, owner: str, repo: str, asset: dict) -> str | None:
+        ...
+
+
+class GitHubSource(Source):
+    kind = SOURCE_GITHUB
+
+    def __init__(self, url: str | None = None):
+        super().__init__(url or github_api.GITHUB_API)
+
+    def probe_url(self) -> str:
+        return f"{self.url}/rate_limit"
+
+    def iter_release_pages(self, owner, repo, per_page, url=None):
+        return github_api.iter_release_pages(owner, repo, per_page, url, api=self.url)
+
+    def get_release_by_tag(self, owner, repo, tag):
+        return github_api.get_release_by_tag(owner, repo, tag, api=self.url)
+
+    def asset_url(self, owner, repo, asset):
+        tag = asset.get("tag")
+        if asset.get("browser_download_url") or not tag:
+            return asset.get("browser_download_url")
+        return f"{GITHUB_DOWNLOAD}/{owner}/{repo}/releases/download/{quote(tag)}/{quote(asset['name'])}"
+
+
+class ManifestSource(Source):
+    def __init__(self, kind: str, url: str):
+        super().__init__(url)
+        self.kind = kind
+
+    def probe_url(self) -> str:
+        return f"{self.url}/{MANIFEST_NAME}"
+
+    def _manifest(self) -> list[dict]:
+        r = get_client().get(self.probe_url())
+        r.raise_for_status()
+        data = r.json()
+        return data.get("releases", []) if isinstance(data, dict) else data
+
+    def _url_for(self, tag: str, name: str) -> str:
+        return f"{self.url}/{quote(tag)}/{quote(name)}"
+
+    def iter_release_pages(self, owner, repo, per_page, url=None):
+        yield self._manifest(), None
+
+    def get_release_by_tag(self, owner, repo, tag):
+        for release in self._manifest():
+            if (release.get("tag_name") or release.get("name")) == tag:
+                return release
+        raise LookupError(f"Релиз {tag} не найден в зеркале {self.url}")
+
+    def asset_url(self, owner, repo, asset):
+        tag = asset.get("tag")
+        return self._url_for(tag, asset["name"]) if tag else None
+
+
+def build_source(spec: dict) -> Source | None:
+    kind = spec.get("type", SOURCE_GITHUB)
+    if kind == SOURCE_GITHUB:
+        return GitHubSource(spec.get("url"))
+    if kind == SOURCE_HTTP and spec.get("url"):
+        return ManifestSource(SOURCE_HTTP, spec["url"])
+    if kind == SOURCE_LOCAL and spec.get("path"):
+        return ManifestSource(SOURCE_LOCAL, Path(spec["path"]).expanduser().resolve().as_uri())
+    return None
+
+
+class SourceSet:
+    def __init__(self, owner: str, repo: str, sources: list[Source] | None = None):
+        self.owner = owner
+        self.repo = repo
+        self._sources = sources
+        self.latency: dict[str, float | None] = {}
+        self.probed_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def sources(self) -> list[Source]:
+        if self._sources is None:
+            specs = load_config().get("sources") or DEFAULT_SOURCES
+            self._sources = [s for s in map(build_source, specs) if s is not None] or [GitHubSource()]
+        return self._sources
+
+    def probe(self) -> dict[str, float | None]:
+        sources = self.sources
+        with ThreadPoolExecutor(max_workers=len(sources)) as ex:
+            results = dict(zip((s.name for s in sources), ex.map(lambda s: s.probe(), sources)))
+        with self._lock:
+            self.latency = results
+            self.probed_at = time.monotonic()
+        return dict(results)
+
+    def ranked(self) -> list[Source]:
+        sources = self.sources
+        if len(sources) == 1:
+            return list(sources)
+        if not self.probed_at or time.monotonic() - self.probed_at > PROBE_TTL:
+            self.probe()
+        with self._lock:
+            latency = dict(self.latency)
+        healthy = sorted((s for s in sources if latency.get(s.name) is not None), key=lambda s: latency[s.name])
+        return healthy + [s for s in sources if latency.get(s.name) is None]
+
+    def mark_failed(self, source: Source) -> None:
+        with self._lock:
+            self.latency[source.name] = None
+
+    def iter_release_pages(self, per_page: int, url: str | None = None) -> Iterator[tuple[list[dict], str | None]]:
+        error: Exception | None = None
+        for source in self.ranked():
+            pages = source.iter_release_pages(self.owner, self.repo, per_page, url if url and source.owns(url) else None)
+            try:
+                first = next(pages)
+            except (OSError, ValueError) as e:
+                self.mark_failed(source)
+                error = e
+                continue
+            yield first
+            yield from pages
+            return
+        raise error or LookupError("не настроены источники релизов")
+
+    def get_release_by_tag(self, tag: str) -> dict:
+        error: Exception | None = None
+        for source in self.ranked():
+            try:
+                return source.get_release_by_tag(self.owner, self.repo, tag)
+            except (OSError, ValueError, LookupError) as e:
+                if isinstance(e, OSError):
+                    self.mark_failed(source)
+                error = e
+        raise error or LookupError("не настроены источники релизов")
+
+    def asset_urls(self, asset: dict) -> list[str]:
+        urls: list[str] = []
+        for source in self.ranked():
+            url = source.asset_url(self.owner, self.repo, asset)
+            if url and url not in urls:
+                urls.append(url)
+        return urls or [asset["browser_download_url"]]
@@ -0,0 +1,63 @@
+import json
+import os
+import sys
+import time
+
+from launcher.config import get_app_dir
+
+STARTUP_TIMING_FLAG = "--startup-timing"
+STARTUP_TIMING_ENV = "WWMRU_STARTUP_TIMING"
+STARTUP_LOG = "startup_timing.jsonl"
+
+_T0 = time.perf_counter()
+
+
+class StartupTimer:
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.phases: list[tuple[str, float]] = []
+        self._last = _T0
+        self._done = False
+
+    def mark(self, phase: str) -> None:
+        if not self.enabled or self._done:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self._last) * 1000))
+        self._last = now
+
+    def report(self) -> dict:
+        return {
+            "at": time.time(),
+            "frozen": bool(getattr(sys, "frozen", False)),
+            "total_ms": round((self._last - _T0) * 1000, 1),
+            "phases": {name: round(ms, 1) for name, ms in self.phases},
+        }
+
+    def finish(self) -> dict | None:
+        if not self.enabled or self._done:
+            return None
+        self._done = True
+        report = self.report()
+
+        if sys.stderr is not None:
+            for name, ms in report["phases"].items():
+                print(f"startup: {name:<20} {ms:8.1f} ms", file=sys.stderr)
+            print(f"startup: {'time to first paint':<20} {report['total_ms']:8.1f} ms", file=sys.stderr)
+
+        try:
+            with open(get_app_dir() / STARTUP_LOG, "a", encoding="utf-8") as f:
+                f.write(json.dumps(report, ensure_ascii=False) + "\n")
+        except OSError:
+            pass
+        return report
+
+
+def _enabled() -> bool:
+    if STARTUP_TIMING_FLAG in sys.argv:
+        sys.argv.remove(STARTUP_TIMING_FLAG)
+        return True
+    return os.environ.get(STARTUP_TIMING_ENV, "") not in ("", "0")
+
+
+startup_timer = StartupTimer(_enabled())
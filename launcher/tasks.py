@@ -0,0 +1,135 @@
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable
+
+TASK_WORKERS = 4
+
+
+class Task:
+    def __init__(self, fn: Callable, args: tuple, kwargs: dict, key: str | None, serial: str | None):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.key = key
+        self.serial = serial
+        self.cancel = threading.Event()
+        self.future: Future = Future()
+
+
+class TaskExecutor:
+    def __init__(self, max_workers: int = TASK_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="wwmru-task")
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._lock = threading.Lock()
+        self._inflight: dict[str, Task] = {}
+        self._serial_busy: set[str] = set()
+        self._serial_waiting: dict[str, deque[Task]] = {}
+        self._tasks: set[Task] = set()
+        self._active = 0
+        self._queued = 0
+
+    @property
+    def active_count(self) -> int:
+        with self._lock:
+            return self._active
+
+    @property
+    def queued_count(self) -> int:
+        with self._lock:
+            return self._queued
+
+    def submit(
+        self,
+        fn: Callable,
+        *args,
+        key: str | None = None,
+        serial: str | None = None,
+        cancellable: bool = False,
+        on_done: Callable[[Future], None] | None = None,
+        **kwargs,
+    ) -> Task:
+        with self._lock:
+            if key is not None and key in self._inflight:
+                task = self._inflight[key]
+                if on_done is not None:
+                    task.future.add_done_callback(on_done)
+                return task
+
+            task = Task(fn, args, kwargs, key, serial)
+            if cancellable:
+                task.kwargs["cancel"] = task.cancel
+            if on_done is not None:
+                task.future.add_done_callback(on_done)
+            if key is not None:
+                self._inflight[key] = task
+            self._tasks.add(task)
+
+            if serial is not None and serial in self._serial_busy:
+                self._serial_waiting.setdefault(serial, deque()).append(task)
+                self._queued += 1
+            else:
+                if serial is not None:
+                    self._serial_busy.add(serial)
+                self._start(task)
+        return task
+
+    def _start(self, task: Task) -> None:
+        self._queued += 1
+        if task.serial is not None:
+            self._pool.submit(self._run, task)
+        else:
+            threading.Thread(target=self._run_detached, args=(task,), name="wwmru-io", daemon=True).start()
+
+    def _run_detached(self, task: Task) -> None:
+        with self._slots:
+            self._run(task)
+
+    def _run(self, task: Task) -> None:
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+
+        result = error = None
+        cancelled = task.cancel.is_set()
+        if not cancelled:
+            try:
+                result = task.fn(*task.args, **task.kwargs)
+            except BaseException as e:
+                error = e
+
+        with self._lock:
+            self._active -= 1
+            self._tasks.discard(task)
+            if task.key is not None and self._inflight.get(task.key) is task:
+                del self._inflight[task.key]
+            if task.serial is not None:
+                waiting = self._serial_waiting.get(task.serial)
+                if waiting:
+                    self._queued -= 1
+                    self._start(waiting.popleft())
+                else:
+                    self._serial_waiting.pop(task.serial, None)
+                    self._serial_busy.discard(task.serial)
+
+        if cancelled:
+            task.future.cancel()
+            task.future.set_running_or_notify_cancel()
+        elif error is not None:
+            task.future.set_exception(error)
+        else:
+            task.future.set_result(result)
+
+    def cancel_all(self) -> None:
+        with self._lock:
+            tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel.set()
+
+    def shutdown(self, timeout: float | None = None) -> bool:
+        self.cancel_all()
+        with self._lock:
+            futures = [task.future for task in self._tasks]
+        _, pending = wait(futures, timeout=timeout)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        return not pending
@@ -0,0 +1,166 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from launcher.config import get_app_dir, load_config
+
+TRACE_LOG = "trace.jsonl"
+TRACE_MAX_BYTES = 1024 * 1024
+TRACE_BACKUPS = 3
+HISTOGRAM_WINDOW = 512
+HISTOGRAM_BOUNDS_MS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class Span:
+    def __init__(self, name: str, parent: str | None, attrs: dict):
+        self.name = name
+        self.id = os.urandom(4).hex()
+        self.parent = parent
+        self.attrs = attrs
+        self.started = time.perf_counter()
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+
+def _percentile(values: list[float], q: float) -> float:
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class RollingHistogram:
+    def __init__(self, window: int | None = HISTOGRAM_WINDOW):
+        self.samples: deque[tuple[float, int, bool]] = deque(maxlen=window)
+
+    def add(self, ms: float, nbytes: int = 0, ok: bool = True) -> None:
+        self.samples.append((ms, nbytes, ok))
+
+    def summary(self) -> dict:
+        times = sorted(ms for ms, _, _ in self.samples)
+        if not times:
+            return {"count": 0}
+        nbytes = sum(b for _, b, _ in self.samples)
+        transfer_s = sum(ms for ms, b, _ in self.samples if b) / 1000
+        buckets = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        for ms in times:
+            buckets[sum(1 for bound in HISTOGRAM_BOUNDS_MS if ms > bound)] += 1
+        return {
+            "count": len(times),
+            "errors": sum(1 for _, _, ok in self.samples if not ok),
+            "p50_ms": _percentile(times, 0.5),
+            "p90_ms": _percentile(times, 0.9),
+            "p99_ms": _percentile(times, 0.99),
+            "max_ms": times[-1],
+            "bytes": nbytes,
+            "bytes_per_s": nbytes / transfer_s if transfer_s > 0 else None,
+            "buckets": buckets,
+        }
+
+
+class Tracer:
+    def __init__(self, path: Path | None = None):
+        self.path = path
+        self.enabled: bool | None = None
+        self.histograms: dict[str, RollingHistogram] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _log_path(self) -> Path:
+        if self.path is None:
+            self.path = get_app_dir() / TRACE_LOG
+        return self.path
+
+    @contextmanager
+    def span(self, name: str, **attrs) -> Iterator[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        s = Span(name, stack[-1].id if stack else None, attrs)
+        stack.append(s)
+        error = None
+        try:
+            yield s
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            stack.pop()
+            self._finish(s, error)
+
+    def _finish(self, s: Span, error: str | None) -> None:
+        ms = (time.perf_counter() - s.started) * 1000
+        nbytes = int(s.attrs.get("bytes") or 0)
+        record = {
+            "ts": time.time(),
+            "span": s.name,
+            "id": s.id,
+            "parent": s.parent,
+            "ms": round(ms, 2),
+            "ok": error is None,
+        }
+        if error is not None:
+            record["error"] = error
+        record.update(s.attrs)
+
+        with self._lock:
+            self.histograms.setdefault(s.name, RollingHistogram()).add(ms, nbytes, error is None)
+            if self.enabled is None:
+                self.enabled = bool(load_config().get("trace_enabled", True))
+            if self.enabled:
+                self._write(json.dumps(record, ensure_ascii=False, default=str))
+
+    def _write(self, line: str) -> None:
+        p = self._log_path()
+        try:
+            if p.exists() and p.stat().st_size > TRACE_MAX_BYTES:
+                for i in range(TRACE_BACKUPS - 1, 0, -1):
+                    older = p.with_name(f"{p.name}.{i}")
+                    if older.exists():
+                        os.replace(older, p.with_name(f"{p.name}.{i + 1}"))
+                os.replace(p, p.with_name(f"{p.name}.1"))
+            with open(p, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError:
+            pass
+
+    def summary(self) -> dict[str, dict]:
+        with self._lock:
+            return {name: h.summary() for name, h in sorted(self.histograms.items())}
+
+
+def _records(path: Path | None) -> Iterator[dict]:
+    p = path or get_app_dir() / TRACE_LOG
+    for f in [p.with_name(f"{p.name}.{i}") for i in range(TRACE_BACKUPS, 0, -1)] + [p]:
+        try:
+            lines = f.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            continue
+        for line in lines:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def load_stats(path: Path | None = None) -> dict[str, dict]:
+    histograms: dict[str, RollingHistogram] = {}
+    for record in _records(path):
+        h = histograms.setdefault(record.get("span", "?"), RollingHistogram(window=None))
+        h.add(record.get("ms", 0.0), int(record.get("bytes") or 0), record.get("ok", True))
+    return {name: h.summary() for name, h in sorted(histograms.items())}
+
+
+def load_cache_stats(path: Path | None = None) -> dict[str, int]:
+    counts = {"hits": 0, "revalidated": 0, "misses": 0}
+    for record in _records(path):
+        if record.get("cache") in counts:
+            counts[record["cache"]] += 1
+    return counts
+
+
+tracer = Tracer()
+span = tracer.span
@@ -0,0 +1,199 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+from launcher import github_api, http_client, tracing
+from launcher.github_api import DownloadCancelledError, download_asset
+from launcher.progress import ProgressTracker
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        srv = self.server
+        srv.requests.append({"Range": self.headers.get("Range"), "If-Range": self.headers.get("If-Range")})
+        if srv.status != 200:
+            self.send_response(srv.status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        data = srv.data
+        first, last = 0, len(data) - 1
+        rng = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if rng and srv.ranges and (if_range is None or if_range == srv.etag or not srv.honor_if_range):
+            start, _, end = rng[len("bytes="):].partition("-")
+            first, last = int(start), int(end) if end else len(data) - 1
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {first}-{last}/{len(data)}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(last - first + 1))
+        self.send_header("ETag", srv.etag)
+        self.end_headers()
+
+        body = data[first:last + 1]
+        drop_after = srv.drop_after
+        if drop_after is not None:
+            srv.drop_after = None
+            srv.status = srv.status_after_drop
+            self.wfile.write(body[:drop_after])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, data: bytes, etag: str = '"v1"'):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.data = data
+        self.etag = etag
+        self.ranges = True
+        self.honor_if_range = True
+        self.drop_after: int | None = None
+        self.status = 200
+        self.status_after_drop = 200
+        self.requests: list[dict] = []
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}/asset.bin"
+
+
+def _range_start(request: dict) -> int:
+    return int(request["Range"][len("bytes="):].partition("-")[0])
+
+
+def setUpModule():
+    global _saved_client, _saved_trace
+    _saved_client = http_client._client
+    _saved_trace = tracing.tracer.enabled
+    http_client._client = http_client.HttpClient(retries=0, backoff=0)
+    tracing.tracer.enabled = False
+
+
+def tearDownModule():
+    http_client._client.close()
+    http_client._client = _saved_client
+    tracing.tracer.enabled = _saved_trace
+
+
+class DownloadTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dst = Path(self.tmp.name) / "asset.bin"
+        self.part = Path(self.tmp.name) / "asset.bin.part"
+        self.meta = Path(self.tmp.name) / "asset.bin.part.json"
+        self.data = os.urandom(1024 * 1024)
+        self.server = _Server(self.data)
+        patcher = mock.patch.object(github_api, "RETRY_BACKOFF", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def _asset(self, urls: list[str] | None = None) -> dict:
+        return {"name": "asset.bin", "size": len(self.server.data), "browser_download_url": (urls or [self.server.url])[0]}
+
+    def _download(self, urls: list[str] | None = None, **kwargs) -> str:
+        return download_asset(
+            self._asset(urls),
+            str(self.dst),
+            expected_sha256=hashlib.sha256(self.server.data).hexdigest(),
+            urls=urls,
+            **kwargs,
+        )
+
+    def _leave_part(self, data: bytes, length: int, etag: str) -> None:
+        self.part.write_bytes(data[:length])
+        self.meta.write_text(json.dumps({"url": self.server.url, "size": len(data), "etag": etag}), encoding="utf-8")
+
+    def test_resumes_after_dropped_connection(self):
+        self.server.drop_after = 300_000
+
+        self._download()
+
+        self.assertEqual(self.dst.read_bytes(), self.data)
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(self.server.requests[1]["If-Range"], '"v1"')
+        self.assertIn(_range_start(self.server.requests[1]), range(1, 300_001))
+        self.assertFalse(self.part.exists())
+        self.assertFalse(self.meta.exists())
+
+    def test_restarts_when_server_ignores_range(self):
+        self.server.ranges = False
+        self._leave_part(self.data, 100_000, '"v1"')
+
+        self._download()
+
+        self.assertEqual(self.dst.read_bytes(), self.data)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(self.server.requests[0]["Range"], "bytes=100000-")
+
+    def test_restarts_when_etag_changes(self):
+        self._leave_part(os.urandom(len(self.data)), 100_000, '"v0"')
+
+        self._download()
+
+        self.assertEqual(self.dst.read_bytes(), self.data)
+        self.assertEqual(self.server.requests[0]["If-Range"], '"v0"')
+
+    def test_restarts_when_changed_file_is_sent_as_range(self):
+        self.server.honor_if_range = False
+        self._leave_part(os.urandom(len(self.data)), 100_000, '"v0"')
+
+        self._download()
+
+        self.assertEqual(self.dst.read_bytes(), self.data)
+        self.assertEqual([r["Range"] for r in self.server.requests], ["bytes=100000-", None])
+
+    def test_fails_over_to_next_source_mid_download(self):
+        mirror = _Server(self.data, etag='"mirror"')
+        self.addCleanup(mirror.server_close)
+        self.addCleanup(mirror.shutdown)
+        self.server.drop_after = 400_000
+        self.server.status_after_drop = 503
+
+        self._download(urls=[self.server.url, mirror.url])
+
+        self.assertEqual(self.dst.read_bytes(), self.data)
+        self.assertIn(_range_start(mirror.requests[0]), range(1, 400_001))
+
+    def test_segmented_download_resumes_after_cancel(self):
+        self.server.data = os.urandom(2 * github_api.SEGMENT_MIN_SIZE + 512 * 1024)
+        cancel = threading.Event()
+        tracker = ProgressTracker(lambda p: cancel.set() if p.done > 3 * 1024 * 1024 else None, interval=0)
+
+        with self.assertRaises(DownloadCancelledError):
+            self._download(segmented=True, cancel=cancel, progress=tracker)
+        saved = json.loads(self.meta.read_text(encoding="utf-8"))["segments"]
+        self.assertTrue(any(pos > start for start, pos, _ in saved))
+
+        self.server.requests.clear()
+        self._download(segmented=True)
+
+        self.assertEqual(self.dst.read_bytes(), self.server.data)
+        starts = {_range_start(r) for r in self.server.requests[1:]}
+        self.assertFalse(starts & {start for start, pos, _ in saved if pos > start})
+
+
+if __name__ == "__main__":
+    unittest.main()